@@ -0,0 +1,227 @@
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import wave
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from pipeline import chunk_sentences, join_wav_files, load_document, text_cache_version
+from text_cache import TextCache
+from tts_backends import create_engine
+
+
+class EngineFileRenderer:
+    """Render text to an audio file with a TTS backend's save_to_file"""
+
+    def __init__(self, backend="pyttsx3", rate=180, volume=1.0, voice=None):
+        self.engine = create_engine(backend, rate, volume, voice)
+
+    def render(self, text, path):
+        self.engine.save_to_file(text, path)
+        self.engine.runAndWait()
+
+
+_renderer = None
+_renderer_key = None
+
+
+def init_worker(backend, settings):
+    """Process-pool initializer: build one renderer per worker process"""
+    global _renderer, _renderer_key
+    _renderer = EngineFileRenderer(backend, **settings)
+    _renderer_key = (backend, sorted(settings.items()))
+
+
+def render_chunk(text, path):
+    """Process-pool task: synthesize one chunk of text to `path`"""
+    started = time.perf_counter()
+    _renderer.render(text, path)
+    return path, time.perf_counter() - started
+
+
+def render_chunk_with(backend, settings, text, path):
+    """Process-pool task: like render_chunk, rebuilding the renderer only when settings change"""
+    if _renderer_key != (backend, sorted(settings.items())):
+        init_worker(backend, settings)
+    return render_chunk(text, path)
+
+
+def warm_up():
+    """Process-pool task that returns once this worker's renderer is ready"""
+    return os.getpid()
+
+
+class BatchSynthesizer:
+    """Render many PDFs to audio files, synthesizing chunks in parallel processes"""
+
+    def __init__(self, output_dir, backend="pyttsx3", workers=1, rate=180, volume=1.0,
+                 voice=None, chunk_chars=1500, window=2):
+        self.output_dir = output_dir
+        self.backend = backend
+        self.workers = max(1, workers)
+        self.settings = {"rate": rate, "volume": volume, "voice": voice}
+        self.chunk_chars = chunk_chars
+        self.window = max(1, window)  # documents in synthesis at once
+        self.text_cache = TextCache(version=text_cache_version)
+
+    def load_sentences(self, pdf_file):
+        """Extract and segment one PDF; returns (pages, sentences) or None"""
+        if not os.path.exists(pdf_file):
+            print(f"❌ File '{pdf_file}' not found!")
+            return None
+        try:
+            document = load_document(pdf_file, cache=self.text_cache)
+        except Exception as e:
+            print(f"❌ Error reading PDF {pdf_file}: {e}")
+            return None
+        return document.total_pages, document.sentences
+
+    def run(self, pdf_files):
+        """Synthesize every PDF and return a throughput report"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix="pdf-batch-")
+        started = time.perf_counter()
+        documents = []
+
+        context = multiprocessing.get_context("spawn")
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                     initializer=init_worker,
+                                     initargs=(self.backend, self.settings)) as pool:
+                # Only `window` documents are in synthesis at once, so pending chunks and their
+                # temporary files never cover the whole batch
+                in_flight = deque()
+                for doc_index, pdf_file in enumerate(pdf_files):
+                    # Extract the next document while earlier chunks are still being synthesized
+                    loaded = self.load_sentences(pdf_file)
+                    if not loaded or not loaded[1]:
+                        print(f"⚠️  Skipping {pdf_file}: no text extracted")
+                        documents.append({"file": pdf_file, "ok": False})
+                        continue
+
+                    pages, sentences = loaded
+                    futures = []
+                    for chunk_index, chunk in enumerate(chunk_sentences(sentences, self.chunk_chars)):
+                        chunk_path = os.path.join(work_dir, f"{doc_index:05d}-{chunk_index:06d}.wav")
+                        futures.append(pool.submit(render_chunk, chunk, chunk_path))
+                    document = {"file": pdf_file, "ok": True, "pages": pages,
+                                "sentences": len(sentences), "futures": futures}
+                    documents.append(document)
+                    in_flight.append(document)
+
+                    # Join documents as soon as they are done; wait for the oldest when the window is full
+                    while in_flight and (len(in_flight) > self.window
+                                         or all(future.done() for future in in_flight[0]["futures"])):
+                        self.finish_document(in_flight.popleft())
+
+                while in_flight:
+                    self.finish_document(in_flight.popleft())
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        return self.build_report(documents, time.perf_counter() - started)
+
+    def finish_document(self, document):
+        """Wait for a document's chunks and join them, in order, into one file"""
+        futures = document.pop("futures")
+        stem = os.path.splitext(os.path.basename(document["file"]))[0]
+        out_path = os.path.join(self.output_dir, f"{stem}.wav")
+
+        try:
+            results = [future.result() for future in futures]
+        except Exception as e:
+            print(f"❌ Synthesis failed for {document['file']}: {e}")
+            document["ok"] = False
+            for future in futures:
+                future.cancel()
+            for future in futures:
+                if not future.cancelled() and future.exception() is None:
+                    try:
+                        os.remove(future.result()[0])
+                    except OSError:
+                        pass
+            return
+
+        paths = [path for path, _ in results]
+        document["synthesis_seconds"] = sum(seconds for _, seconds in results)
+        try:
+            # Each chunk file is deleted once it is in the output, so temp disk stays at one window
+            document["audio_seconds"] = join_wav_files(paths, out_path, remove_parts=True)
+            document["output"] = out_path
+        except (wave.Error, EOFError) as e:
+            # Not WAV (e.g. AIFF from the macOS driver): keep the chunks as separate files
+            chunk_dir = os.path.join(self.output_dir, stem)
+            os.makedirs(chunk_dir, exist_ok=True)
+            for index, path in enumerate(paths):
+                shutil.move(path, os.path.join(chunk_dir, f"{index:06d}{os.path.splitext(path)[1]}"))
+            document["audio_seconds"] = None
+            document["output"] = chunk_dir
+            print(f"⚠️  Could not join audio for {document['file']} ({e}); kept {len(paths)} chunk files")
+
+        print(f"✅ {document['file']} → {document['output']}")
+
+    def build_report(self, documents, wall_seconds):
+        finished = [doc for doc in documents if doc["ok"]]
+        pages = sum(doc["pages"] for doc in finished)
+        audio_seconds = sum(doc.get("audio_seconds") or 0.0 for doc in finished)
+        return {
+            "documents": documents,
+            "backend": self.backend,
+            "workers": self.workers,
+            "wall_seconds": wall_seconds,
+            "pages": pages,
+            "pages_per_second": pages / wall_seconds if wall_seconds else 0.0,
+            "audio_seconds": audio_seconds,
+            "audio_seconds_per_wall_second": audio_seconds / wall_seconds if wall_seconds else 0.0,
+        }
+
+
+def print_report(report):
+    print("\n📊 Batch synthesis report")
+    print("-" * 50)
+    print(f"   Documents:      {sum(1 for doc in report['documents'] if doc['ok'])}/{len(report['documents'])}")
+    print(f"   Pages:          {report['pages']}")
+    print(f"   Wall time:      {report['wall_seconds']:.1f} s with {report['workers']} workers")
+    print(f"   Pages/sec:      {report['pages_per_second']:.2f}")
+    print(f"   Audio produced: {report['audio_seconds']:.1f} s "
+          f"({report['audio_seconds_per_wall_second']:.2f} audio-s per wall-s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render PDFs to audio files without any prompts")
+    parser.add_argument("pdf_files", nargs="+", help="PDF files to convert")
+    parser.add_argument("-o", "--output-dir", default="audio", help="directory for the audio files")
+    parser.add_argument("--workers", type=int, default=0, metavar="N",
+                        help="synthesis processes (0 = one per CPU core)")
+    parser.add_argument("--backend", default="pyttsx3",
+                        help="pyttsx3, espeak, null or module:factory (default: pyttsx3)")
+    parser.add_argument("--rate", type=int, default=180, help="speech rate in WPM")
+    parser.add_argument("--volume", type=float, default=1.0, help="volume from 0.0 to 1.0")
+    parser.add_argument("--voice", help="voice id to use")
+    parser.add_argument("--chunk-chars", type=int, default=1500,
+                        help="approximate characters per synthesized chunk")
+    parser.add_argument("--window", type=int, default=2, metavar="N",
+                        help="documents in synthesis at once; bounds temporary disk use (default: 2)")
+    parser.add_argument("--report", metavar="FILE", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    synthesizer = BatchSynthesizer(
+        args.output_dir, backend=args.backend,
+        workers=args.workers if args.workers > 0 else (os.cpu_count() or 1),
+        rate=args.rate, volume=args.volume, voice=args.voice, chunk_chars=args.chunk_chars,
+        window=args.window,
+    )
+    report = synthesizer.run(args.pdf_files)
+    print_report(report)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
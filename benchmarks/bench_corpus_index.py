@@ -0,0 +1,60 @@
+"""Corpus indexing: a full build, then re-runs with nothing and with a few files changed
+
+A re-run should cost a directory scan plus work for the changed files only,
+however large the corpus.
+
+Usage: python benchmarks/bench_corpus_index.py [--files 2000] [--pages 2] [--change 10] [--workers 4]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus_index import CorpusIndex  # noqa: E402
+from synthetic_pdf import write_pdf  # noqa: E402
+
+
+def timed_update(index, folder, workers, label):
+    started = time.perf_counter()
+    report = index.update([folder], workers=workers, verbose=False)
+    seconds = time.perf_counter() - started
+    print(f"{label:<22} {seconds:>8.2f} s   added {report['added']}, updated {report['updated']}, "
+          f"unchanged {report['unchanged']}")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--pages", type=int, default=2, help="pages per PDF")
+    parser.add_argument("--change", type=int, default=10, help="files to rewrite before the last run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = os.path.join(tmp, "corpus")
+        for number in range(args.files):
+            directory = os.path.join(folder, f"{number // 500:03d}")
+            os.makedirs(directory, exist_ok=True)
+            write_pdf(os.path.join(directory, f"{number:06d}.pdf"), args.pages, lines=10, seed=number)
+        print(f"📚 {args.files} PDFs of {args.pages} pages, {args.workers} workers")
+
+        with CorpusIndex(os.path.join(tmp, "index.sqlite3")) as index:
+            timed_update(index, folder, args.workers, "full build")
+            timed_update(index, folder, args.workers, "re-run, no changes")
+
+            rng = random.Random(0)
+            for number in rng.sample(range(args.files), min(args.change, args.files)):
+                path = os.path.join(folder, f"{number // 500:03d}", f"{number:06d}.pdf")
+                write_pdf(path, args.pages, lines=10, seed=number + args.files)
+            timed_update(index, folder, args.workers, f"re-run, {args.change} changed")
+
+
+if __name__ == "__main__":
+    main()
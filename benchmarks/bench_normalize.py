@@ -0,0 +1,70 @@
+"""Cost of text normalization relative to PDF extraction on a large document
+
+The PDF has a running header and a page-number footer on every page, so header
+detection, dehyphenation and expansion all have work to do. Extraction and
+normalization are timed separately on the same pages; the overhead is
+normalization time as a percentage of extraction time.
+
+Usage: python benchmarks/bench_normalize.py [--pages 2000] [--lines 40] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from normalization import TextNormalizer, expand  # noqa: E402
+from pipeline import extract_pages, segment_pages  # noqa: E402
+from synthetic_pdf import write_pdf  # noqa: E402
+
+
+def best_time(func, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=40, help="text lines per page")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the best is kept")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = os.path.join(tmp, "headed.pdf")
+        write_pdf(file_name, args.pages, args.lines, headers=True)
+        extract_pages(file_name).close()  # import PyPDF2 outside the timings
+        extract_seconds, pages = best_time(lambda: list(extract_pages(file_name)), args.repeat)
+
+    def normalize():
+        normalizer = TextNormalizer()
+        return normalizer, list(normalizer.normalize(pages))
+
+    expand.cache_clear()
+    normalize_seconds, (normalizer, normalized) = best_time(normalize, args.repeat)
+    segment_seconds, sentences = best_time(lambda: sum(1 for _ in segment_pages(normalized)), args.repeat)
+    chars = sum(len(text) for _, text in pages)
+    cache = expand.cache_info()
+
+    print(f"📄 {args.pages} pages, {chars / 1024 / 1024:.1f} MB of text, {sentences} sentences")
+    print(f"{'extract':<12} {extract_seconds:>8.3f} s   {args.pages / extract_seconds:>9.0f} pages/s")
+    print(f"{'normalize':<12} {normalize_seconds:>8.3f} s   {args.pages / normalize_seconds:>9.0f} pages/s")
+    print(f"{'segment':<12} {segment_seconds:>8.3f} s   {args.pages / segment_seconds:>9.0f} pages/s")
+    print(f"⏱️  Normalization adds {normalize_seconds / extract_seconds * 100:.1f}% to extraction time")
+    print(f"🧹 Removed {normalizer.removed_lines} header/footer lines "
+          f"({normalizer.removed_lines / args.pages:.1f} per page)")
+    print(f"🧠 Expansion cache: {cache.hits} hits, {cache.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""PDF input: buffered file vs memory-mapped, wall time and peak memory
+
+Each configuration runs in a fresh process. Memory is sampled from /proc for the
+process and its extraction workers (Linux only): RSS includes file pages mapped
+from the page cache, "anon" only memory the processes allocated themselves.
+
+Usage: python benchmarks/bench_pdf_input.py [--pages 300] [--image-kb 512] [--workers 1 4]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def process_tree(pid):
+    """pid plus all of its descendants"""
+    pids = [pid]
+    for task in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                for child_pid in f.read().split():
+                    pids.extend(process_tree(int(child_pid)))
+        except OSError:
+            pass
+    return pids
+
+
+def memory_kb(pid):
+    """(rss, anonymous) in KB from /proc/<pid>/smaps_rollup"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return fields.get("Rss", 0), fields.get("Anonymous", 0)
+
+
+class MemorySampler:
+    """Track peak total RSS and anonymous memory of this process tree"""
+
+    def __init__(self, interval=0.02):
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_anon = 0
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while True:
+            rss = anon = 0
+            for pid in process_tree(os.getpid()):
+                try:
+                    pid_rss, pid_anon = memory_kb(pid)
+                except OSError:
+                    continue
+                rss += pid_rss
+                anon += pid_anon
+            self.peak_rss = max(self.peak_rss, rss)
+            self.peak_anon = max(self.peak_anon, anon)
+            if self._done.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        self._thread.join()
+
+
+def child(file_name, use_mmap, workers):
+    """Extract every page and report timings as JSON on stdout"""
+    from pdf_extraction import PdfPageStream
+
+    with MemorySampler() as memory:
+        started = time.perf_counter()
+        pages = PdfPageStream(file_name, verbose=False, workers=workers, use_mmap=use_mmap)
+        characters = sum(len(text) for _, text in pages)
+        seconds = time.perf_counter() - started
+    print(json.dumps({
+        "seconds": seconds,
+        "characters": characters,
+        "rss_mb": memory.peak_rss / 1024,
+        "anon_mb": memory.peak_anon / 1024,
+    }))
+
+
+def run_child(file_name, use_mmap, workers):
+    command = [sys.executable, os.path.abspath(__file__), "--child", file_name,
+               "--workers", str(workers)] + ([] if use_mmap else ["--no-mmap"])
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--image-kb", type=int, default=512,
+                        help="binary payload per page, to make the file large")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--file", help="benchmark this PDF instead of a synthetic one")
+    parser.add_argument("--child", metavar="PDF", help=argparse.SUPPRESS)
+    parser.add_argument("--no-mmap", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, not args.no_mmap, args.workers[0])
+        return
+
+    from synthetic_pdf import write_pdf
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = args.file
+        if not file_name:
+            file_name = os.path.join(tmp, "bench.pdf")
+            size = write_pdf(file_name, args.pages, image_kb=args.image_kb)
+            print(f"Synthetic PDF: {args.pages} pages, {size / 1024 / 1024:.0f} MB")
+
+        if not os.path.exists("/proc/self/smaps_rollup"):
+            print("⚠️  /proc/self/smaps_rollup not available; memory columns will be 0")
+        print(f"{'input':<8} {'workers':>7} {'wall s':>8} {'peak RSS MB':>12} {'peak anon MB':>13}")
+        for workers in args.workers:
+            for use_mmap in (False, True):
+                result = run_child(file_name, use_mmap, workers)
+                print(f"{'mmap' if use_mmap else 'file':<8} {workers:>7} {result['seconds']:>8.2f} "
+                      f"{result['rss_mb']:>12.1f} {result['anon_mb']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Sentence segmentation throughput: legacy prepare_text split vs SentenceSegmenter
+
+Usage: python benchmarks/bench_segmenter.py [--megabytes 8]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from segmenter import SentenceSegmenter, iter_sentences  # noqa: E402
+
+WORDS = ("the reader extracts text from every page and speaks each sentence aloud "
+         "while the listener adjusts speed volume and voice as needed").split()
+EXTRAS = ["e.g. manuals", "approx. 3.14 units", "Dr. Smith", "in the U.S. market", "(see Fig. 2)"]
+
+
+def make_pages(megabytes, page_chars=3000, seed=1):
+    """Synthetic page texts totalling roughly `megabytes` MB"""
+    rng = random.Random(seed)
+    pages = []
+    total = 0
+    while total < megabytes * 1024 * 1024:
+        lines = []
+        size = 0
+        while size < page_chars:
+            words = rng.choices(WORDS, k=rng.randint(6, 24))
+            if rng.random() < 0.2:
+                words.insert(rng.randint(0, len(words)), rng.choice(EXTRAS))
+            sentence = " ".join(words).capitalize() + rng.choice([".", ".", ".", "?", "!"])
+            lines.append(sentence)
+            size += len(sentence) + 1
+        page = "\n".join(lines)
+        pages.append(page)
+        total += len(page)
+    return pages
+
+
+def legacy_prepare_text(text):
+    """The original prepare_text splitting logic, kept for comparison"""
+    clean_text = text.replace('\n', ' ').replace('\r', ' ')
+    clean_text = ' '.join(clean_text.split())
+    sentences = re.split(r'([.!?]+)', clean_text)
+    result = []
+    for i in range(0, len(sentences) - 1, 2):
+        sentence = sentences[i].strip()
+        if i + 1 < len(sentences):
+            sentence += sentences[i + 1]
+        if sentence.strip() and len(sentence.strip()) > 5:
+            result.append(sentence.strip())
+    return result
+
+
+# (text, expected sentence count): ordinary words that are also abbreviations must still end sentences
+CASES = [
+    ("The cat sat. Then it left.", 2),
+    ("He said no. Then he left.", 2),
+    ("We walked in the sun. It was hot.", 2),
+    ("I met Ed. He was nice.", 2),
+    ("It happened in Dec. Nobody noticed.", 2),
+    ("See No. 5 and p. 12 of ch. 3 for details.", 1),
+    ("Dr. Smith et al. (2010) measured it, e.g. in Fig. 2. It worked.", 2),
+    ("It cost approx. five dollars. We paid.", 2),
+]
+
+
+def check_cases():
+    """Sentence counts for CASES; returns the cases that came out wrong"""
+    return [(text, expected, SentenceSegmenter().segment(text)) for text, expected in CASES
+            if len(SentenceSegmenter().segment(text)) != expected]
+
+
+def measure(label, func):
+    started = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - started
+
+    # Peak memory is measured in a second run; tracemalloc slows everything down
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {count:>9} sentences  {elapsed:7.3f} s  "
+          f"{count / elapsed:>11,.0f} sentences/s  peak {peak / 1024 / 1024:7.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=8)
+    args = parser.parse_args()
+
+    failures = check_cases()
+    for text, expected, sentences in failures:
+        print(f"❌ {text!r}: expected {expected} sentences, got {sentences}")
+    if failures:
+        return 1
+
+    pages = make_pages(args.megabytes)
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / 1024 / 1024:.1f} MB of text\n")
+
+    # Sentences are counted, not kept, so peak memory reflects the segmenter itself
+    measure("legacy (whole document)", lambda: len(legacy_prepare_text("\n".join(pages))))
+    measure("SentenceSegmenter (pages)", lambda: sum(1 for _ in iter_sentences(pages)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Start-up time: module import breakdown and wall time of quick commands
+
+The import breakdown comes from `python -X importtime -c "import myreaderV1"`.
+Commands run in fresh processes with empty cache and state directories, so
+--list-voices with the null backend includes writing the voice catalog once.
+
+Usage: python benchmarks/bench_startup.py [--repeat 5] [--top 12] [--root OTHER_CHECKOUT] [--output FILE]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+    "help": ["--help"],
+    "list-voices": ["--list-voices", "--backend", "null"],
+    "extract-only": ["{pdf}", "--extract-only", "--no-cache"],
+}
+
+
+def import_times(root):
+    """[(cumulative_us, self_us, module)] for importing myreaderV1, slowest first"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import myreaderV1"],
+                            cwd=root, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), module.rstrip()))
+    return sorted(rows, reverse=True)
+
+
+def time_command(root, arguments, env, repeat):
+    """Wall-clock seconds of each run of myreaderV1.py with these arguments"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "myreaderV1.py"] + arguments, cwd=root, env=env,
+                       stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12, help="modules to show in the import breakdown")
+    parser.add_argument("--root", default=ROOT, help="checkout to measure (default: this one)")
+    parser.add_argument("--output", metavar="FILE", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    from synthetic_pdf import write_pdf
+
+    rows = import_times(args.root)
+    total_us = max(cumulative for cumulative, _, _ in rows)
+    print(f"📦 import myreaderV1: {total_us / 1000:.1f} ms")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for cumulative, self_us, module in rows[:args.top]:
+        print(f"{cumulative / 1000:>14.1f} {self_us / 1000:>8.1f}  {module}")
+
+    results = {"import_ms": total_us / 1000, "commands": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = os.path.join(tmp, "startup.pdf")
+        write_pdf(pdf, 20)
+        env = dict(os.environ, XDG_CACHE_HOME=os.path.join(tmp, "cache"), XDG_STATE_HOME=os.path.join(tmp, "state"))
+
+        print(f"\n{'command':<14} {'min ms':>8} {'median ms':>10}")
+        for name, arguments in COMMANDS.items():
+            times = time_command(args.root, [a.format(pdf=pdf) for a in arguments], env, args.repeat)
+            results["commands"][name] = {"min_ms": min(times) * 1000, "median_ms": statistics.median(times) * 1000}
+            print(f"{name:<14} {min(times) * 1000:>8.0f} {statistics.median(times) * 1000:>10.0f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Benchmark suite for the reader's hot paths, with a JSON baseline to compare against
+
+For each document size a synthetic PDF is generated and measured in a fresh process:
+
+  extract_pages_per_s       read_pdf_content, text cache off
+  segment_sentences_per_s   prepare_text on the extracted text
+  peak_rss_mb, peak_anon_mb memory of the process tree during extraction + segmentation
+  first_sentence_ms         opening the PDF until the first sentence can be spoken (streaming)
+  schedule_us_per_sentence  speak_sentences_with_controls with an instant null TTS engine
+                            and no pause between sentences, i.e. the reader's own overhead
+
+Usage:
+  python benchmarks/bench_suite.py --output baseline.json
+  python benchmarks/bench_suite.py --baseline baseline.json   # exits 1 on a regression
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_pdf_input import MemorySampler  # noqa: E402
+
+RESULTS_FORMAT = 1
+
+# metric: (better, allowed relative change, absolute slack for tiny values)
+THRESHOLDS = {
+    "extract_pages_per_s": ("higher", 0.20, 0.0),
+    "segment_sentences_per_s": ("higher", 0.20, 0.0),
+    "peak_rss_mb": ("lower", 0.15, 5.0),
+    "first_sentence_ms": ("lower", 0.30, 5.0),
+    "schedule_us_per_sentence": ("lower", 0.30, 50.0),
+}
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the reader's progress output while timing it"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def new_reader():
+    from myreaderV1 import ReadMyText
+    from tts_backends import NullEngine
+
+    reader = ReadMyText()
+    reader.use_cache = False
+    reader.assume_yes = True  # no restart question at the end
+    reader.sentence_gap = 0
+    reader.initialize_engine = lambda: NullEngine(time_scale=0)
+    return reader
+
+
+def measure(file_name, pages, speak_limit):
+    """All metrics for one PDF, in this process"""
+    result = {"pages": pages}
+    # PyPDF2 is imported on first use; keep that out of the timings (bench_startup.py covers it)
+    from pdf_extraction import extractor_version
+    extractor_version()
+
+    reader = new_reader()
+    with MemorySampler() as memory:
+        with quiet():
+            started = time.perf_counter()
+            text = reader.read_pdf_content(file_name)
+            extracted = time.perf_counter()
+            reader.prepare_text(text)
+            segmented = time.perf_counter()
+    result["sentences"] = len(reader.sentences)
+    result["extract_pages_per_s"] = pages / (extracted - started)
+    result["segment_sentences_per_s"] = len(reader.sentences) / (segmented - extracted)
+    result["peak_rss_mb"] = memory.peak_rss / 1024
+    result["peak_anon_mb"] = memory.peak_anon / 1024
+
+    streaming = new_reader()
+    with quiet():
+        started = time.perf_counter()
+        streaming.stream_pdf_sentences(file_name)
+        streaming.has_sentence(0)
+        result["first_sentence_ms"] = (time.perf_counter() - started) * 1000
+        streaming.close_pdf_stream()
+
+    count = min(speak_limit, len(reader.sentences))
+    reader.sentences = reader.sentences.section(0, count)
+    with quiet():
+        reader.start_speech_worker()  # engine start-up is not part of the loop
+        started = time.perf_counter()
+        reader.speak_sentences_with_controls()
+        elapsed = time.perf_counter() - started
+        reader.stop_speech_worker()
+    result["spoken"] = reader.current_sentence_index
+    result["schedule_us_per_sentence"] = elapsed / max(1, reader.current_sentence_index) * 1e6
+    return result
+
+
+def run_child(file_name, pages, speak_limit, state_dir):
+    command = [sys.executable, os.path.abspath(__file__), "--child", file_name,
+               "--sizes", str(pages), "--speak", str(speak_limit)]
+    env = dict(os.environ, XDG_CACHE_HOME=state_dir, XDG_STATE_HOME=state_dir)
+    output = subprocess.run(command, check=True, capture_output=True, text=True,
+                            stdin=subprocess.DEVNULL, env=env).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def best_of(runs):
+    """Combine repeated runs, keeping the best value of every metric"""
+    best = dict(runs[0])
+    for run in runs[1:]:
+        for metric, (better, _, _) in THRESHOLDS.items():
+            pick = max if better == "higher" else min
+            best[metric] = pick(best[metric], run[metric])
+    return best
+
+
+def compare(baseline, current):
+    """Regression messages for metrics that got worse than their threshold allows"""
+    regressions = []
+    for size, result in current["results"].items():
+        base = baseline.get("results", {}).get(size)
+        if base is None:
+            continue
+        for metric, (better, relative, slack) in THRESHOLDS.items():
+            if metric not in base:
+                continue
+            old, new = base[metric], result[metric]
+            if better == "higher":
+                worse = new < old * (1 - relative) - slack
+            else:
+                worse = new > old * (1 + relative) + slack
+            if worse:
+                change = (new - old) / old * 100 if old else float("inf")
+                regressions.append(f"{size} pages: {metric} {old:.1f} -> {new:.1f} ({change:+.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 500, 2000],
+                        help="document sizes in pages")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per size; the best is kept")
+    parser.add_argument("--speak", type=int, default=2000, metavar="N",
+                        help="sentences to schedule for the overhead measurement")
+    parser.add_argument("--output", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare with earlier results; exit 1 on regressions")
+    parser.add_argument("--child", metavar="PDF", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.sizes[0], args.speak)))
+        return 0
+
+    from synthetic_pdf import write_pdf
+
+    results = {}
+    print(f"{'pages':>6} {'extract p/s':>12} {'segment s/s':>12} {'RSS MB':>8} "
+          f"{'first ms':>9} {'sched us':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.sizes:
+            file_name = os.path.join(tmp, f"{pages}.pdf")
+            write_pdf(file_name, pages)
+            result = best_of([run_child(file_name, pages, args.speak, tmp) for _ in range(max(1, args.repeat))])
+            results[str(pages)] = result
+            print(f"{pages:>6} {result['extract_pages_per_s']:>12.1f} {result['segment_sentences_per_s']:>12,.0f} "
+                  f"{result['peak_rss_mb']:>8.1f} {result['first_sentence_ms']:>9.1f} "
+                  f"{result['schedule_us_per_sentence']:>9.0f}")
+
+    report = {
+        "format": RESULTS_FORMAT,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "thresholds": {metric: {"better": better, "relative": relative, "slack": slack}
+                       for metric, (better, relative, slack) in THRESHOLDS.items()},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report)
+        if regressions:
+            print("❌ Regressions against baseline:")
+            for message in regressions:
+                print(f"   {message}")
+            return 1
+        print("✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Write synthetic text PDFs for the benchmarks
+
+Usage: python benchmarks/synthetic_pdf.py out.pdf [--pages 200] [--lines 40] [--image-kb 0] [--headers]
+
+--image-kb adds an unused binary stream of that size to every page, standing in
+for the scanned images that make real archives large. --headers adds a running
+header (alternating between odd and even pages) and a page-number footer.
+"""
+import argparse
+import os
+import random
+
+WORDS = ("the reader extracts text from every page and speaks each sentence aloud "
+         "while the listener adjusts speed volume and voice as needed").split()
+EXTRAS = ["e.g. manuals", "approx. 3.14 units", "Dr. Smith", "in the U.S. market", "(see Fig. 2)"]
+
+
+def page_lines(rng, page_number, lines):
+    for line in range(lines):
+        words = rng.choices(WORDS, k=rng.randint(6, 14))
+        if rng.random() < 0.2:
+            words.insert(rng.randint(0, len(words)), rng.choice(EXTRAS))
+        text = " ".join(words).capitalize() + rng.choice([".", ".", "?", "!"])
+        yield f"Page {page_number} line {line + 1}: {text}"
+
+
+def running_lines(page_number):
+    """Header and footer lines of a page, as in a typeset book"""
+    header = "A Synthetic Document" if page_number % 2 else "Chapter 1. Reading Aloud"
+    return header, f"- {page_number} -"
+
+
+def write_pdf(path, pages, lines=40, image_kb=0, seed=1, headers=False):
+    """Write a PDF with `pages` pages of Helvetica text; returns the file size"""
+    rng = random.Random(seed)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(1, pages + 1):
+        commands = []
+        text_lines = list(page_lines(rng, page, lines))
+        if headers:
+            header, footer = running_lines(page)
+            text_lines = [header, *text_lines, footer]
+        for number, line in enumerate(text_lines):
+            line = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            commands.append(f"BT /F1 10 Tf 40 {780 - number * 18} Td ({line}) Tj ET")
+        content = "\n".join(commands).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        content_id = len(objects)
+
+        resources = b"/Font << /F1 3 0 R >>"
+        if image_kb:
+            blob = os.urandom(image_kb * 1024)
+            objects.append(b"<< /Type /XObject /Subtype /Image /Width 1 /Height %d /ColorSpace /DeviceGray"
+                           b" /BitsPerComponent 8 /Length %d >>\nstream\n%s\nendstream"
+                           % (len(blob), len(blob), blob))
+            resources += b" /XObject << /Im1 %d 0 R >>" % len(objects)
+
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << %s >>"
+                       b" /Contents %d 0 R >>" % (resources, content_id))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+    return len(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic PDF for benchmarking")
+    parser.add_argument("output")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--lines", type=int, default=40)
+    parser.add_argument("--image-kb", type=int, default=0)
+    parser.add_argument("--headers", action="store_true")
+    args = parser.parse_args()
+    size = write_pdf(args.output, args.pages, args.lines, args.image_kb, headers=args.headers)
+    print(f"Wrote {args.pages} pages ({size / 1024 / 1024:.1f} MB) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import re
+from bisect import bisect_right
+
+WORD_PATTERN = re.compile(r"\S+")
+# Places where a long sentence can be split without breaking a phrase: after , ; : or
+# a closing bracket, and around dashes. The split goes after the following space.
+CLAUSE_PATTERN = re.compile(r"(?:[,;:)\]][\"'”’]*|\s[–—-])\s+")
+
+
+class Chunk:
+    """One utterance: whole sentences merged together, or a clause-aligned piece of one"""
+
+    __slots__ = ("index", "offset", "end_index", "end_offset", "text", "starts")
+
+    def __init__(self, index, offset, end_index, end_offset, text, starts=(0,)):
+        self.index = index            # first sentence and character offset into it
+        self.offset = offset
+        self.end_index = end_index    # where the next chunk starts
+        self.end_offset = end_offset
+        self.text = text
+        self.starts = list(starts)    # offset in text where each merged sentence begins
+
+    @property
+    def key(self):
+        return self.index, self.offset
+
+    def position(self, text_offset):
+        """(sentence index, character offset) of a character offset into text"""
+        number = max(0, bisect_right(self.starts, text_offset) - 1)
+        if number == 0:
+            return self.index, self.offset + text_offset
+        return self.index + number, text_offset - self.starts[number]
+
+
+class SpeechChunker:
+    """Plans utterances of about target_seconds of speech at the current rate
+
+    Short sentences on the same page are merged until the target is reached,
+    and sentences longer than max_seconds are split at clause boundaries.
+    Durations are estimated from word counts and the rate in words per minute.
+    Plans are memoized per starting position and dropped when the rate or the
+    sentences change, so re-chunking happens lazily, one utterance at a time.
+    """
+
+    def __init__(self, target_seconds=6.0, max_seconds=None):
+        self.target_seconds = target_seconds
+        self.max_seconds = max_seconds or 2 * target_seconds
+        self._rate = None
+        self._sentences = None
+        self._plans = {}
+
+    def next_chunk(self, sentences, has_sentence, index, offset, rate):
+        """The chunk starting at sentence `index`, character `offset`
+
+        sentences is a SentenceIndex; has_sentence(i) loads sentence i if needed.
+        """
+        if rate != self._rate or sentences is not self._sentences or len(self._plans) > 4096:
+            self._rate = rate
+            self._sentences = sentences
+            self._plans = {}
+        chunk = self._plans.get((index, offset))
+        if chunk is None:
+            chunk = self._plans[index, offset] = self._plan(sentences, has_sentence, index, offset, rate)
+        return chunk
+
+    def _plan(self, sentences, has_sentence, index, offset, rate):
+        words_per_second = max(1, rate) / 60.0
+        target_words = max(1, round(self.target_seconds * words_per_second))
+        max_words = max(target_words, round(self.max_seconds * words_per_second))
+
+        rest = sentences[index][offset:]
+        words = len(WORD_PATTERN.findall(rest))
+        if words > max_words:
+            cut = self._split_point(rest, target_words, max_words)
+            return Chunk(index, offset, index, offset + cut, rest[:cut].rstrip())
+
+        # Merge following sentences while they fit, staying on the same page
+        parts, starts = [rest], [0]
+        length = len(rest)
+        end = index + 1
+        page = sentences.page_of(index)
+        while words < target_words and has_sentence(end) and sentences.page_of(end) == page:
+            sentence = sentences[end]
+            count = len(WORD_PATTERN.findall(sentence))
+            if words + count > max_words:
+                break
+            starts.append(length + 1)
+            parts.append(sentence)
+            length += len(sentence) + 1
+            words += count
+            end += 1
+        return Chunk(index, offset, end, 0, " ".join(parts), starts)
+
+    def _split_point(self, text, target_words, max_words):
+        """Character offset to end the first piece of a long text at"""
+        word_starts = [match.start() for match in WORD_PATTERN.finditer(text)]
+        best = None
+        for match in CLAUSE_PATTERN.finditer(text):
+            count = bisect_right(word_starts, match.start())  # words before the boundary
+            if count > max_words:
+                break
+            if best is None or abs(count - target_words) < abs(best[0] - target_words):
+                best = (count, match.end())
+        if best is not None and best[0] >= target_words // 2:
+            return best[1]
+        # No clause boundary close enough: split between words
+        return word_starts[target_words]
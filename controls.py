@@ -0,0 +1,51 @@
+import sys
+import threading
+import time
+
+
+class ConsoleInput:
+    """Daemon thread that turns stdin lines into ('command', text, received_at) events"""
+
+    def __init__(self, events, stream=None):
+        self.events = events
+        self.stream = stream or sys.stdin
+        self.closed = False
+        self._thread = threading.Thread(target=self._run, name="console-input", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            for line in iter(self.stream.readline, ""):
+                self.events.put(("command", line.strip().lower(), time.perf_counter()))
+        except (OSError, ValueError):
+            pass
+        self.closed = True
+        self.events.put(("eof",))
+
+
+class Utterance:
+    """One chunk of text (see chunker.py) currently being spoken"""
+
+    __slots__ = ("chunk", "job", "cancelled", "started_at")
+
+    def __init__(self, chunk):
+        self.chunk = chunk
+        self.job = None
+        self.cancelled = False
+        self.started_at = time.perf_counter()
+
+    @property
+    def index(self):
+        return self.chunk.index
+
+    def cancel(self):
+        """Interrupt speech at the next word boundary"""
+        self.cancelled = True
+        if self.job is not None:
+            self.job.cancel()
+
+    def resume_position(self):
+        """(sentence index, character offset) of the last word that started playing"""
+        if self.job is None or not self.job.word_offset:
+            return self.chunk.index, self.chunk.offset
+        return self.chunk.position(self.job.word_offset)
@@ -0,0 +1,311 @@
+"""Full-text index of folders of PDFs in SQLite (FTS5), updated incrementally
+
+A run walks the given folders and stats every PDF under them, but reads only
+files whose size or mtime changed: those are hashed, and extracted again only
+when their contents (or the extractor, normalizer and segmenter versions)
+changed. Beyond the directory scan, re-indexing costs time proportional to
+what changed. Moved or renamed files are recognised by their hash.
+
+Usage:
+  python corpus_index.py papers/ archive/ --workers 8
+  python corpus_index.py --search "fourier transform"
+  python myreader.py --search "fourier transform"   # read a match from its sentence
+"""
+import argparse
+import itertools
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from pipeline import load_document, text_cache_version
+from text_cache import default_cache_dir, file_sha256
+
+# Bump when the schema changes; an index in an older format is rebuilt from scratch
+INDEX_FORMAT = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    version TEXT NOT NULL,
+    pages INTEGER NOT NULL,
+    sentences INTEGER NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS sentences (
+    id INTEGER PRIMARY KEY,
+    document INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sentences_by_document ON sentences (document);
+CREATE VIRTUAL TABLE IF NOT EXISTS sentence_text USING fts5 (
+    text, content='sentences', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+-- The full-text index follows the sentences table, so replacing a document only touches its rows
+CREATE TRIGGER IF NOT EXISTS sentences_added AFTER INSERT ON sentences BEGIN
+    INSERT INTO sentence_text (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS sentences_removed AFTER DELETE ON sentences BEGIN
+    INSERT INTO sentence_text (sentence_text, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+def default_index_path():
+    return os.path.join(default_cache_dir(), "corpus.sqlite3")
+
+
+def scan_pdfs(roots):
+    """{path: (size, mtime_ns)} of the PDFs in the given folders (recursively) and files"""
+    found = {}
+    for root in roots:
+        root = os.path.abspath(root)
+        if os.path.isdir(root):
+            paths = (os.path.join(directory, name) for directory, _, names in os.walk(root)
+                     for name in names if name.lower().endswith(".pdf"))
+        else:
+            paths = [root]
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            found[path] = (stat.st_size, stat.st_mtime_ns)
+    return found
+
+
+def is_under(path, roots):
+    return any(path == root or path.startswith(root.rstrip(os.sep) + os.sep) for root in roots)
+
+
+def hash_file(path):
+    """Process-pool task: (path, SHA-256 or None if the file cannot be read)"""
+    try:
+        return path, file_sha256(path)
+    except OSError:
+        return path, None
+
+
+def extract_file(path):
+    """Process-pool task: (path, pages, [(sentence, page)], error) for one PDF"""
+    try:
+        document = load_document(path)
+    except Exception as e:
+        return path, 0, [], str(e)
+    sentences = document.sentences
+    return path, document.total_pages, [(sentence, sentences.page_of(i)) for i, sentence in enumerate(sentences)], None
+
+
+def imap_unordered(pool, func, items, window):
+    """func(item) for every item in completion order, with at most `window` tasks in flight"""
+    if pool is None:
+        yield from map(func, items)
+        return
+    items = iter(items)
+    pending = {pool.submit(func, item) for item in itertools.islice(items, window)}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        pending |= {pool.submit(func, item) for item in itertools.islice(items, len(done))}
+        for future in done:
+            yield future.result()
+
+
+class SearchHit:
+    """One matching sentence"""
+
+    __slots__ = ("path", "sentence", "page", "text", "snippet")
+
+    def __init__(self, path, sentence, page, text, snippet):
+        self.path = path
+        self.sentence = sentence  # index among the document's sentences, as the reader numbers them
+        self.page = page
+        self.text = text
+        self.snippet = snippet
+
+    def position(self):
+        """Where to start reading, in the form of a saved session"""
+        return {"sentence": self.sentence, "page": self.page, "text": self.text[:80]}
+
+
+class CorpusIndex:
+    """Sentences of many PDFs in one SQLite database with an FTS5 full-text index"""
+
+    def __init__(self, path=None):
+        self.path = path or default_index_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != INDEX_FORMAT:
+            self.db.executescript("DROP TABLE IF EXISTS sentence_text; DROP TABLE IF EXISTS sentences;"
+                                  "DROP TABLE IF EXISTS documents;")
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version={INDEX_FORMAT}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        self.db.close()
+
+    def update(self, roots, workers=1, verbose=True):
+        """Bring the index up to date with the PDFs under roots; returns a report dict"""
+        started = time.perf_counter()
+        roots = [os.path.abspath(root) for root in roots]
+        version = text_cache_version()
+        found = scan_pdfs(roots)
+        known = {row[1]: row for row in self.db.execute(
+            "SELECT id, path, size, mtime_ns, hash, version FROM documents")}
+
+        report = {"files": len(found), "unchanged": 0, "added": 0, "updated": 0, "moved": 0,
+                  "removed": 0, "failed": 0}
+        changed = [path for path, stat in found.items()
+                   if path not in known or known[path][2:4] != stat or known[path][5] != version]
+        gone = [path for path in known if path not in found and is_under(path, roots)]
+        report["unchanged"] = len(found) - len(changed)
+
+        pool = None
+        if changed and workers > 1:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # spawn, like the page extraction pool, so workers start from a clean interpreter
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            hashes = dict(imap_unordered(pool, hash_file, changed, workers * 4))
+            extract = self._reuse_unchanged(changed, gone, hashes, known, found, version, report)
+            for path in gone:
+                self._remove(known[path][0])
+                report["removed"] += 1
+
+            for path, pages, sentences, error in imap_unordered(pool, extract_file, extract, workers * 2):
+                old = known.get(path)
+                self._store(old[0] if old else None, path, found[path], hashes[path], version,
+                            pages, sentences, error)
+                if error:
+                    report["failed"] += 1
+                    print(f"❌ {path}: {error}")
+                else:
+                    report["updated" if old else "added"] += 1
+                    if verbose:
+                        print(f"✅ {path}: {len(sentences)} sentences from {pages} pages")
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        report["seconds"] = time.perf_counter() - started
+        return report
+
+    def _reuse_unchanged(self, changed, gone, hashes, known, found, version, report):
+        """Update files whose contents did not change in place; returns the paths to extract"""
+        gone_by_hash = {known[path][4]: path for path in gone if known[path][5] == version}
+        extract = []
+        with self.db:
+            for path in changed:
+                digest = hashes[path]
+                old = known.get(path)
+                if digest is None:
+                    continue  # vanished or unreadable since the scan; tried again next time
+                if old and old[4] == digest and old[5] == version:
+                    document_id = old[0]
+                    report["unchanged"] += 1
+                elif not old and digest in gone_by_hash:
+                    moved_from = gone_by_hash.pop(digest)
+                    gone.remove(moved_from)
+                    document_id = known[moved_from][0]
+                    report["moved"] += 1
+                else:
+                    extract.append(path)
+                    continue
+                self.db.execute("UPDATE documents SET path = ?, size = ?, mtime_ns = ? WHERE id = ?",
+                                (path, *found[path], document_id))
+        return extract
+
+    def _store(self, document_id, path, stat, digest, version, pages, sentences, error):
+        """Replace one document's sentences; committed per document so an interrupted run keeps its work"""
+        with self.db:
+            values = (path, *stat, digest, version, pages, len(sentences), error)
+            if document_id is None:
+                document_id = self.db.execute(
+                    "INSERT INTO documents (path, size, mtime_ns, hash, version, pages, sentences, error)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", values).lastrowid
+            else:
+                self.db.execute("DELETE FROM sentences WHERE document = ?", (document_id,))
+                self.db.execute("UPDATE documents SET path = ?, size = ?, mtime_ns = ?, hash = ?, version = ?,"
+                                " pages = ?, sentences = ?, error = ? WHERE id = ?", values + (document_id,))
+            self.db.executemany("INSERT INTO sentences (document, number, page, text) VALUES (?, ?, ?, ?)",
+                                ((document_id, number, page, text)
+                                 for number, (text, page) in enumerate(sentences)))
+
+    def _remove(self, document_id):
+        with self.db:
+            self.db.execute("DELETE FROM sentences WHERE document = ?", (document_id,))
+            self.db.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+
+    def search(self, query, limit=20):
+        """Best matching sentences for an FTS5 query; plain words if it is not valid query syntax"""
+        sql = ("SELECT d.path, s.number, s.page, s.text, snippet(sentence_text, 0, '[', ']', '…', 16)"
+               " FROM sentence_text JOIN sentences s ON s.id = sentence_text.rowid"
+               " JOIN documents d ON d.id = s.document"
+               " WHERE sentence_text MATCH ? ORDER BY rank LIMIT ?")
+        try:
+            rows = self.db.execute(sql, (query, limit)).fetchall()
+        except sqlite3.OperationalError:
+            words = " ".join('"{}"'.format(word.replace('"', '""')) for word in query.split())
+            rows = self.db.execute(sql, (words, limit)).fetchall() if words else []
+        return [SearchHit(*row) for row in rows]
+
+    def stats(self):
+        """(documents, sentences) in the index"""
+        return self.db.execute("SELECT COUNT(*), COALESCE(SUM(sentences), 0) FROM documents").fetchone()
+
+
+def print_report(report):
+    print(f"📚 {report['files']:,} PDFs checked in {report['seconds']:.2f} s: "
+          f"{report['added']} added, {report['updated']} updated, {report['moved']} moved, "
+          f"{report['removed']} removed, {report['failed']} failed, {report['unchanged']:,} unchanged")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index folders of PDFs for full-text search")
+    parser.add_argument("roots", nargs="*", metavar="folder", help="folders (searched recursively) or PDF files")
+    parser.add_argument("--index", metavar="FILE", help=f"index database (default: {default_index_path()})")
+    parser.add_argument("--workers", type=int, default=0, metavar="N",
+                        help="extraction processes (0 = one per CPU core)")
+    parser.add_argument("--search", metavar="QUERY", help="print the best matching sentences")
+    parser.add_argument("--limit", type=int, default=20, help="matches to show with --search")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print failures and the summary")
+    args = parser.parse_args(argv)
+    if not args.roots and not args.search:
+        parser.error("give folders to index and/or --search QUERY")
+
+    try:
+        index = CorpusIndex(args.index)
+    except sqlite3.Error as e:
+        print(f"❌ Unable to open the index: {e}")
+        return 1
+    with index:
+        if args.roots:
+            workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+            print_report(index.update(args.roots, workers=workers, verbose=not args.quiet))
+        if args.search:
+            hits = index.search(args.search, args.limit)
+            if not hits:
+                print(f"🔎 No matches for '{args.search}'")
+            for hit in hits:
+                print(f"{hit.path}:{hit.page}:{hit.sentence}: {hit.snippet}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,189 @@
+"""Optional spans and counters for the reading pipeline
+
+Nothing is recorded until enable() is called; until then span() returns a shared
+no-op object and record()/count() return immediately, so the calls can stay in
+hot paths. Traces are written as JSON lines (files ending in .jsonl) or in the
+Chrome trace format (anything else; open in chrome://tracing or Perfetto).
+"""
+import json
+import os
+import threading
+import time
+
+_tracer = None
+_profiler = None
+_profile_path = None
+
+
+class JsonLinesWriter:
+    """One JSON object per span or counter update"""
+
+    def __init__(self, f):
+        self.f = f
+
+    def span(self, name, start, duration, thread, args):
+        self._write({"type": "span", "name": name, "ts": round(start, 6), "ms": round(duration * 1000, 3),
+                     "thread": thread.name, "args": args})
+
+    def counter(self, name, timestamp, value, thread):
+        self._write({"type": "counter", "name": name, "ts": round(timestamp, 6), "value": value})
+
+    def close(self):
+        self.f.close()
+
+    def _write(self, event):
+        self.f.write(json.dumps(event, default=str) + "\n")
+
+
+class ChromeTraceWriter:
+    """Chrome trace events, streamed as a JSON array so a crash still leaves a usable file"""
+
+    def __init__(self, f):
+        self.f = f
+        self.pid = os.getpid()
+        self.threads = set()
+        self.separator = "[\n"
+
+    def span(self, name, start, duration, thread, args):
+        self._name_thread(thread)
+        self._write({"name": name, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6,
+                     "pid": self.pid, "tid": thread.ident, "args": args})
+
+    def counter(self, name, timestamp, value, thread):
+        self._write({"name": name, "ph": "C", "ts": timestamp * 1e6, "pid": self.pid,
+                     "args": {"value": value}})
+
+    def close(self):
+        self.f.write("[]\n" if self.separator == "[\n" else "\n]\n")
+        self.f.close()
+
+    def _name_thread(self, thread):
+        if thread.ident not in self.threads:
+            self.threads.add(thread.ident)
+            self._write({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": thread.ident,
+                         "args": {"name": thread.name}})
+
+    def _write(self, event):
+        self.f.write(self.separator + json.dumps(event, default=str))
+        self.separator = ",\n"
+
+
+class Tracer:
+    """Times spans and sums counters, handing every event to a writer"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.origin = time.perf_counter()
+        self.totals = {}
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def record(self, name, start, duration, args):
+        with self._lock:
+            if not self.closed:
+                self.writer.span(name, start - self.origin, duration, threading.current_thread(), args)
+
+    def count(self, name, value):
+        with self._lock:
+            total = self.totals[name] = self.totals.get(name, 0) + value
+            if not self.closed:
+                self.writer.counter(name, time.perf_counter() - self.origin, total, threading.current_thread())
+
+    def close(self):
+        with self._lock:
+            if not self.closed:
+                self.closed = True
+                self.writer.close()
+
+
+class Span:
+    """Context manager timing one span; set() adds details known only at the end"""
+
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = None
+
+    def set(self, **args):
+        self.args.update(args)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.record(self.name, self.start, time.perf_counter() - self.start, self.args)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def set(self, **args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NO_SPAN = _NoSpan()
+
+
+def enabled():
+    return _tracer is not None
+
+
+def span(name, **args):
+    """Time a `with` block as a span named `name`"""
+    if _tracer is None:
+        return NO_SPAN
+    return Span(_tracer, name, args)
+
+
+def record(name, seconds, **args):
+    """Add a span measured elsewhere (e.g. in a worker process) that ended just now"""
+    if _tracer is not None:
+        _tracer.record(name, time.perf_counter() - seconds, seconds, args)
+
+
+def count(name, value=1):
+    """Add value to the counter `name`"""
+    if _tracer is not None:
+        _tracer.count(name, value)
+
+
+def enable(trace_path=None, profile_path=None):
+    """Start writing spans to trace_path and/or profiling this thread into profile_path"""
+    global _tracer, _profiler, _profile_path
+    if trace_path:
+        f = open(trace_path, "w", encoding="utf-8")
+        writer = JsonLinesWriter(f) if trace_path.endswith(".jsonl") else ChromeTraceWriter(f)
+        _tracer = Tracer(writer)
+    if profile_path:
+        import cProfile
+
+        _profile_path = profile_path
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def disable():
+    """Stop recording and finish the trace and profile files"""
+    global _tracer, _profiler, _profile_path
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.close()
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(_profile_path)
+        print(f"📊 Profile saved to {_profile_path} (view with: python -m pstats {_profile_path})")
+        _profiler = None
+        _profile_path = None
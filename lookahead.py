@@ -0,0 +1,192 @@
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import wave
+
+try:
+    import simpleaudio
+except ImportError:
+    simpleaudio = None
+
+try:
+    import winsound
+except ImportError:
+    winsound = None
+
+
+class AudioClip:
+    """One sentence rendered to in-memory audio"""
+
+    __slots__ = ("index", "text", "data", "duration")
+
+    def __init__(self, index, text, data):
+        self.index = index
+        self.text = text
+        self.data = data
+        try:
+            with wave.open(io.BytesIO(data), "rb") as audio:
+                self.duration = audio.getnframes() / float(audio.getframerate())
+        except (wave.Error, EOFError):
+            self.duration = None  # not WAV (e.g. AIFF on macOS)
+
+
+class LookaheadBuffer:
+    """Render the next few sentences in the background while the current one plays"""
+
+    def __init__(self, render_to_file):
+        self.render_to_file = render_to_file
+        self._clips = {}
+        self._window = []
+        self._settings = None
+        self._generation = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._temp_dir = tempfile.mkdtemp(prefix="pdf-reader-audio-")
+        self._thread = threading.Thread(target=self._run, name="lookahead", daemon=True)
+        self._thread.start()
+
+    def request(self, window, settings):
+        """Set the (index, text) pairs to keep rendered, current sentence first"""
+        with self._cond:
+            if settings != self._settings:
+                self._settings = settings
+                self._drop_all()
+
+            wanted = {index: text for index, text in window}
+            for index in list(self._clips):
+                if wanted.get(index) != self._clips[index].text:
+                    del self._clips[index]
+
+            self._window = list(window)
+            self._cond.notify_all()
+
+    def get(self, index):
+        """Wait for the clip of a sentence in the window; None if it cannot be rendered"""
+        with self._cond:
+            while True:
+                if index in self._clips:
+                    self._window = [item for item in self._window if item[0] != index]
+                    return self._clips.pop(index)
+                if self._closed or not any(i == index for i, _ in self._window):
+                    return None
+                self._cond.wait()
+
+    def invalidate(self):
+        """Discard everything rendered so far, e.g. after a voice or speed change"""
+        with self._cond:
+            self._drop_all()
+            self._cond.notify_all()
+
+    def close(self):
+        """Stop the render thread and remove temporary files"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(5)
+        shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    def _drop_all(self):
+        self._clips.clear()
+        self._generation += 1
+
+    def _next_job(self):
+        for index, text in self._window:
+            if index not in self._clips:
+                return index, text
+        return None
+
+    def _run(self):
+        path = os.path.join(self._temp_dir, "sentence.wav")
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while not self._closed and job is None:
+                    self._cond.wait()
+                    job = self._next_job()
+                if self._closed:
+                    return
+                generation = self._generation
+
+            index, text = job
+            ok = self.render_to_file(text, path)
+            data = None
+            if ok:
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    os.remove(path)
+                except OSError:
+                    data = None
+
+            with self._cond:
+                # A settings change or restart while rendering makes this clip stale
+                if generation == self._generation and any(i == index for i, _ in self._window):
+                    if data:
+                        self._clips[index] = AudioClip(index, text, data)
+                    else:
+                        self._window = [item for item in self._window if item[0] != index]
+                self._cond.notify_all()
+
+
+class AudioPlayer:
+    """Play in-memory audio with whatever the platform provides"""
+
+    def __init__(self):
+        self._process = None
+        self._play_object = None
+        self._winsound_playing = False
+        self.command = self._find_command()
+
+    def _find_command(self):
+        for command in (["aplay", "-q", "-"], ["paplay"], ["afplay"]):
+            if shutil.which(command[0]):
+                return command
+        return None
+
+    def is_available(self):
+        return bool(simpleaudio or winsound or self.command)
+
+    def play(self, clip):
+        """Play a clip and block until it finishes or stop() is called"""
+        try:
+            if simpleaudio and clip.duration is not None:
+                wave_obj = simpleaudio.WaveObject.from_wave_read(wave.open(io.BytesIO(clip.data), "rb"))
+                self._play_object = wave_obj.play()
+                self._play_object.wait_done()
+            elif winsound:
+                self._winsound_playing = True
+                winsound.PlaySound(clip.data, winsound.SND_MEMORY)
+            elif self.command and self.command[0] == "afplay":
+                # afplay only reads from files
+                with tempfile.NamedTemporaryFile(suffix=".aiff", delete=False) as f:
+                    f.write(clip.data)
+                try:
+                    self._process = subprocess.Popen(self.command + [f.name])
+                    self._process.wait()
+                finally:
+                    os.remove(f.name)
+            elif self.command:
+                self._process = subprocess.Popen(self.command, stdin=subprocess.PIPE)
+                self._process.communicate(clip.data)
+            else:
+                return False
+            return True
+        except Exception as e:
+            print(f"❌ Error playing audio: {e}")
+            return False
+        finally:
+            self._process = None
+            self._play_object = None
+            self._winsound_playing = False
+
+    def stop(self):
+        """Interrupt playback started from another thread"""
+        if self._play_object is not None:
+            self._play_object.stop()
+        if self._process is not None:
+            self._process.terminate()
+        if self._winsound_playing:
+            winsound.PlaySound(None, 0)  # stops the sound playing in the other thread
@@ -1,13 +1,28 @@
-import pyttsx3
 import sys
-import PyPDF2
+import argparse
+import contextlib
 import os
+import queue
 import threading
 import time
-import select
-import sys
 from collections import defaultdict
 
+import instrumentation
+from chunker import Chunk, SpeechChunker
+from controls import ConsoleInput, Utterance
+from navigation import WordIndex
+from pdf_extraction import PdfPageStream, Prefetcher, find_chapter, load_outline, parse_page_range
+from pipeline import normalize_pages, segment_pages, select_pages, synthesize, text_cache_version
+from playlist import DocumentPrefetcher, PreparedDocument, expand_paths
+from segmenter import SentenceSegmenter
+from sentence_index import SentenceIndex
+from sessions import SessionStore
+from speech_worker import SpeechWorker
+from text_cache import TextCache
+from text_export import FORMATS, UNITS, export_document
+from tts_backends import BACKENDS, create_engine, load_backend
+from voices import VoiceCatalog, primary_language
+
 
 class ReadMyText:
     def __init__(self):
@@ -15,123 +30,213 @@ class ReadMyText:
         self.is_speaking = False
         self.is_paused = False
         self.should_stop = False
-        self.should_restart = False
-        self.current_text = ""
+        self.pending_jump = None
+        self.pending_reload = None  # ("page" | "sentence", number) before a resumed section
+        self.document_name = None
         self.current_sentence_index = 0
-        self.sentences = []
+        self.sentences = SentenceIndex()
+        self.word_index = WordIndex()
+        self.sentence_stream = None
+        self.prefetcher = None
+        self.prefetch_pages = 4
+        self.total_pages = 0
+        self.first_page = 1
+        self.page_selection = None  # (first, last) pages chosen with --pages or --chapter
+        self.chapter = None
+        self.playlist = []
+        self.playlist_position = 0
+        self.document_prefetcher = None
+        self.prefetch_budget_mb = 64
+        self.skip_document = False
+        self.workers = 1
+        self.use_mmap = False
+        self.text_cache = TextCache(version=text_cache_version)
+        self.use_cache = True
+        self.normalize = True
+        self.sessions = SessionStore()
+        self.doc_hash = None
+        self.resume = False
         self.rate = 180
         self.volume = 1.0
+        self.fixed_settings = set()  # settings given on the command line win over a saved session
+        self.assume_yes = False
+        self.output_path = None
         self.selected_voice = None
         self.available_voices = []
         self.voices_by_language = defaultdict(list)
+        self.voice_catalog = VoiceCatalog()
+        self.refresh_voices = False
+        self.voice_query = None
+        self.language_query = None
+        self.backend = "pyttsx3"
+        self.speech_worker = None
+        self.engine_reported = False
+        self.extract_only = False
+        self.extract_unit = None  # "pages" or "sentences" with --extract
+        self.extract_format = "jsonl"
+        self.record_output = sys.stdout
+        self.start_position = None  # where to start the first document, e.g. a --search match
+        self.lookahead = 0
+        self.sentence_gap = 0.3  # seconds of silence between sentences without lookahead
+        self.chunker = SpeechChunker()  # None speaks one sentence per utterance
+        self.lookahead_buffer = None
+        self.audio_player = None
+        self.events = queue.Queue()
+        self.console_input = None
+        self.utterance = None
 
     def initialize_engine(self):
-        """Initialize TTS engine - called per sentence to avoid threading issues"""
+        """Initialize TTS engine with the current rate, volume and voice"""
         try:
-            engine = pyttsx3.init()
-            engine.setProperty("rate", self.rate)
-            engine.setProperty("volume", self.volume)
-            
-            # Set selected voice if available
-            if self.selected_voice:
-                engine.setProperty('voice', self.selected_voice)
-                
-            return engine
+            return create_engine(self.backend, self.rate, self.volume, self.selected_voice)
         except Exception as e:
             print(f"Unable to initialize TTS engine: {e}")
             return None
 
+    def start_speech_worker(self, wait=True):
+        """Start the long-lived speech worker that owns the TTS engine
+
+        With wait=False the engine starts in the background (e.g. while the PDF
+        is opened); the next call waits for it to be ready.
+        """
+        if self.speech_worker is None or not self.speech_worker.is_running():
+            self.speech_worker = SpeechWorker(self.initialize_engine)
+            self.speech_worker.start(timeout=0)
+            self.engine_reported = False
+        if not wait:
+            return True
+
+        if not self.speech_worker.wait_ready():
+            self.speech_worker = None
+            return False
+        if not self.engine_reported:
+            self.engine_reported = True
+            print(f"⏱️  Engine started in {self.speech_worker.init_time * 1000:.0f} ms")
+        return True
+
+    def stop_speech_worker(self):
+        """Shut down the speech worker and release its engine"""
+        if self.speech_worker:
+            self.speech_worker.stop()
+            self.speech_worker = None
+
+    def sync_speech_settings(self):
+        """Push current rate, volume and voice to the running engine"""
+        if self.speech_worker:
+            self.speech_worker.update_settings(
+                rate=self.rate, volume=self.volume, voice=self.selected_voice
+            )
+        if self.lookahead_buffer:
+            self.lookahead_buffer.invalidate()
+
+    def start_lookahead(self):
+        """Set up background pre-synthesis of the next sentences"""
+        if self.lookahead_buffer:
+            return True
+        if not self.start_speech_worker():
+            return False
+
+        from lookahead import AudioPlayer, LookaheadBuffer
+
+        self.audio_player = AudioPlayer()
+        if not self.audio_player.is_available():
+            print("⚠️  No audio player found (simpleaudio, aplay, paplay or afplay); lookahead disabled")
+            return False
+
+        self.lookahead_buffer = LookaheadBuffer(self.speech_worker.render_to_file)
+        print(f"🎧 Pre-rendering {self.lookahead} utterances ahead for gapless playback")
+        return True
+
+    def stop_lookahead(self):
+        """Stop background pre-synthesis and drop rendered audio"""
+        if self.lookahead_buffer:
+            self.lookahead_buffer.close()
+            self.lookahead_buffer = None
+
+    def next_chunk(self, index, offset=0):
+        """The utterance starting at sentence `index`, character `offset`"""
+        if self.chunker:
+            return self.chunker.next_chunk(self.sentences, self.has_sentence, index, offset, self.rate)
+        return Chunk(index, offset, index + 1, 0, self.sentences[index][offset:])
+
+    def start_utterance(self, index, offset=0):
+        """Begin speaking the chunk at a sentence; completion arrives as a 'finished' event"""
+        chunk = self.next_chunk(index, offset)
+        utterance = Utterance(chunk)
+        self.utterance = utterance
+
+        if self.lookahead:
+            window = [(chunk.key, chunk.text)]
+            while len(window) <= self.lookahead and self.has_sentence(chunk.end_index):
+                chunk = self.next_chunk(chunk.end_index, chunk.end_offset)
+                window.append((chunk.key, chunk.text))
+            self.lookahead_buffer.request(window, (self.rate, self.volume, self.selected_voice))
+            threading.Thread(target=self.play_with_lookahead, args=(utterance,), daemon=True).start()
+        else:
+            utterance.job = self.speech_worker.submit(
+                chunk.text,
+                on_done=lambda job: self.events.put(("finished", utterance, job.ok)),
+            )
+
+    def play_with_lookahead(self, utterance):
+        """Playback thread: wait for the pre-rendered clip and play it"""
+        clip = self.lookahead_buffer.get(utterance.chunk.key)
+        if utterance.cancelled:
+            ok = True
+        elif clip is None:
+            utterance.job = self.speech_worker.submit(utterance.chunk.text)
+            ok = self.speech_worker.wait(utterance.job)
+        else:
+            ok = self.audio_player.play(clip)
+        self.events.put(("finished", utterance, ok))
+
+    def finish_utterance(self, timeout=5):
+        """Interrupt whatever is playing and wait for it to wind down"""
+        utterance = self.utterance
+        if utterance is None:
+            return
+        utterance.cancel()
+        if self.audio_player:
+            self.audio_player.stop()
+
+        deadline = time.perf_counter() + timeout
+        while self.utterance is utterance and time.perf_counter() < deadline:
+            event = self.next_event(deadline - time.perf_counter())
+            if event and event[0] == "finished" and event[1] is utterance:
+                self.utterance = None
+        self.utterance = None
+
+    def show_latency_report(self):
+        """Print per-utterance engine latency collected by the speech worker"""
+        report = self.speech_worker.latency_report() if self.speech_worker else None
+        if report:
+            print(f"⏱️  Engine latency over {report['sentences']} utterances: "
+                  f"avg {report['avg_ms']:.0f} ms, p95 {report['p95_ms']:.0f} ms, "
+                  f"max {report['max_ms']:.0f} ms")
+
+    def enumerate_voices(self):
+        """Ask the TTS engine for its voices (slow; the catalog caches the result)"""
+        # Reuse the reading engine rather than starting a second one just to ask
+        if not self.start_speech_worker():
+            return []
+        return self.speech_worker.call(lambda engine: engine.getProperty('voices')) or []
+
     def get_available_voices(self):
         """Get all available system voices and group them by language"""
         try:
-            temp_engine = pyttsx3.init()
-            voices = temp_engine.getProperty('voices')
-            self.available_voices = []
-            self.voices_by_language = defaultdict(list)
-            
-            if voices:
-                for i, voice in enumerate(voices):
-                    # Clean up voice info for better display
-                    voice_name = voice.name if voice.name else f"Voice {i+1}"
-                    voice_id = voice.id
-                    languages = voice.languages if voice.languages else ["Unknown"]
-                    
-                    voice_info = {
-                        'index': i,
-                        'id': voice_id,
-                        'name': voice_name,
-                        'languages': languages
-                    }
-                    
-                    self.available_voices.append(voice_info)
-                    
-                    # Group by primary language
-                    primary_language = self.get_primary_language(languages)
-                    self.voices_by_language[primary_language].append(voice_info)
-            
-            # Clean up temp engine
-            try:
-                temp_engine.stop()
-                del temp_engine
-            except:
-                pass
-                
+            self.voice_catalog.load(self.enumerate_voices, refresh=self.refresh_voices)
+            self.refresh_voices = False
+            self.available_voices = self.voice_catalog.voices
+            self.voices_by_language = defaultdict(list, self.voice_catalog.by_language)
             return len(self.available_voices) > 0
-            
+
         except Exception as e:
             print(f"❌ Error getting voices: {e}")
             return False
 
     def get_primary_language(self, languages):
         """Extract and clean primary language from language list"""
-        if not languages or languages == ["Unknown"]:
-            return "Unknown"
-        
-        primary = languages[0]
-        
-        # Common language mappings for cleaner display
-        language_mappings = {
-            'en_US': 'English (US)',
-            'en_GB': 'English (UK)',
-            'en_AU': 'English (AU)',
-            'en_CA': 'English (CA)',
-            'es_ES': 'Spanish (Spain)',
-            'es_MX': 'Spanish (Mexico)',
-            'fr_FR': 'French (France)',
-            'fr_CA': 'French (Canada)',
-            'de_DE': 'German',
-            'it_IT': 'Italian',
-            'pt_BR': 'Portuguese (Brazil)',
-            'pt_PT': 'Portuguese (Portugal)',
-            'ru_RU': 'Russian',
-            'ja_JP': 'Japanese',
-            'ko_KR': 'Korean',
-            'zh_CN': 'Chinese (Simplified)',
-            'zh_TW': 'Chinese (Traditional)',
-            'ar_SA': 'Arabic',
-            'hi_IN': 'Hindi',
-            'th_TH': 'Thai',
-            'sv_SE': 'Swedish',
-            'no_NO': 'Norwegian',
-            'da_DK': 'Danish',
-            'fi_FI': 'Finnish',
-            'pl_PL': 'Polish',
-            'nl_NL': 'Dutch',
-            'tr_TR': 'Turkish'
-        }
-        
-        # Try to map to cleaner name
-        if primary in language_mappings:
-            return language_mappings[primary]
-        
-        # If not in mapping, try to extract language code
-        if '_' in primary:
-            lang_code = primary.split('_')[0].upper()
-            country_code = primary.split('_')[1].upper()
-            return f"{lang_code} ({country_code})"
-        
-        # Return as-is if no pattern matches
-        return primary.title()
+        return primary_language(languages)
 
     def display_voices_grouped(self):
         """Display available voices grouped by language"""
@@ -294,7 +399,8 @@ class ReadMyText:
                 try:
                     voice_index = int(choice) - 1
                     if 0 <= voice_index < len(self.available_voices):
-                        selected_voice = self.available_voices[voice_index]
+                        # Numbers follow the grouped listing, not enumeration order
+                        selected_voice = self.voice_catalog.grouped()[voice_index]
                         return self.test_and_confirm_voice(selected_voice)
                     else:
                         print(f"❌ Please enter a number between 1 and {len(self.available_voices)}")
@@ -305,6 +411,23 @@ class ReadMyText:
             print("\n⏭️  Using default voice")
             return True
 
+    def select_voice_from_options(self):
+        """Pick the voice given with --voice/--lang without any menu; False if none matches"""
+        if not self.get_available_voices():
+            print("⚠️  No voices available or unable to detect voices")
+            return False
+
+        voice = self.voice_catalog.find(self.voice_query, self.language_query)
+        if voice is None:
+            wanted = " and ".join(f"'{query}'" for query in (self.voice_query, self.language_query) if query)
+            print(f"❌ No voice matching {wanted}. Languages: {', '.join(self.voice_catalog.languages())}")
+            return False
+
+        self.selected_voice = voice['id']
+        self.sync_speech_settings()
+        print(f"✅ Selected voice: {voice['name']} ({self.get_primary_language(voice['languages'])})")
+        return True
+
     def test_and_confirm_voice(self, selected_voice):
         """Test selected voice and confirm with user"""
         self.selected_voice = selected_voice['id']
@@ -313,15 +436,8 @@ class ReadMyText:
         
         # Test the selected voice
         print("🎤 Testing selected voice...")
-        test_engine = self.initialize_engine()
-        if test_engine:
-            test_engine.say("Hello! This is how I will sound when reading your PDF.")
-            test_engine.runAndWait()
-            try:
-                test_engine.stop()
-                del test_engine
-            except:
-                pass
+        self.sync_speech_settings()
+        self.speak_sentence("Hello! This is how I will sound when reading your PDF.")
         
         try:
             confirm = input("👍 Keep this voice? (y/n): ").lower().strip()
@@ -344,6 +460,11 @@ class ReadMyText:
         print("  'louder' or 'up' - Increase volume")
         print("  'quieter' or 'down' - Decrease volume")
         print("  'restart' or 'r' - Restart from beginning")
+        print("  'goto page N' / 'goto sentence N' - Jump to a page or sentence")
+        print("  'next page' or 'np' / 'prev page' or 'pp' - Skip between pages")
+        print("  'find <words>' or 'f <words>' - Jump to the next sentence containing the words")
+        if len(self.playlist) > 1:
+            print("  'next doc' or 'nd' - Skip to the next document in the playlist")
         print("  'quit' or 'q' - Quit")
         print("  'help' or 'h' - Show this help")
         print("  '' (just Enter) - Continue without command")
@@ -356,6 +477,7 @@ class ReadMyText:
         else:
             self.rate = max(self.rate - 20, 100)  # Min 100 WPM
         
+        self.sync_speech_settings()
         print(f"🔧 Speed set to {self.rate} WPM")
 
     def adjust_volume(self, increase=True):
@@ -365,82 +487,277 @@ class ReadMyText:
         else:
             self.volume = max(self.volume - 0.1, 0.0)
         
+        self.sync_speech_settings()
         print(f"🔊 Volume set to {int(self.volume * 100)}%")
 
-    def has_input_available(self):
-        """Check if input is available without blocking (Unix/Linux/Mac)"""
-        try:
-            # This works on Unix-like systems
-            if hasattr(select, 'select'):
-                ready, _, _ = select.select([sys.stdin], [], [], 0)
-                return bool(ready)
-        except:
-            pass
-        return False
+    def start_console_input(self):
+        """Start the thread that turns typed commands into events"""
+        if self.console_input is None:
+            self.console_input = ConsoleInput(self.events)
 
-    def get_non_blocking_input(self):
-        """Get input without blocking if available"""
+    def next_event(self, timeout):
+        """Wait for the next event; None on timeout"""
         try:
-            if self.has_input_available():
-                return input().strip().lower()
-        except:
-            pass
-        return None
+            return self.events.get(timeout=max(0.0, timeout))
+        except queue.Empty:
+            return None
+
+    def ask(self, prompt):
+        """Read one answer, through the console thread once it is running"""
+        if self.console_input is None:
+            return input(prompt)
+
+        print(prompt, end="", flush=True)
+        while True:
+            event = self.next_event(0.5)
+            if event is None:
+                if self.console_input.closed:
+                    raise EOFError
+            elif event[0] == "command":
+                return event[1]
+            elif event[0] == "eof":
+                raise EOFError
 
     def prepare_text(self, text):
         """Prepare text by splitting into sentences"""
-        # Clean text
-        clean_text = text.replace('\n', ' ').replace('\r', ' ')
-        clean_text = ' '.join(clean_text.split())  # Remove extra whitespace
-        
-        # Split into sentences
-        import re
-        sentences = re.split(r'([.!?]+)', clean_text)
-        
-        # Rejoin sentences with their punctuation
-        self.sentences = []
-        for i in range(0, len(sentences)-1, 2):
-            sentence = sentences[i].strip()
-            if i+1 < len(sentences):
-                sentence += sentences[i+1]
-            if sentence.strip() and len(sentence.strip()) > 5:  # Filter very short fragments
-                self.sentences.append(sentence.strip())
-        
+        with instrumentation.span("segment.document", chars=len(text)) as span:
+            self.sentences = SentenceIndex(SentenceSegmenter().segment(text))
+            span.set(sentences=len(self.sentences))
+        self.word_index = WordIndex()
+        self.sentence_stream = None
         self.current_sentence_index = 0
         print(f"📝 Prepared {len(self.sentences)} sentences for reading")
 
+    def spoken_pages(self, pages):
+        """Normalize a stream of (page_number, text) pages for speech, unless --no-normalize"""
+        return normalize_pages(pages) if self.normalize else pages
+
+    def iter_sentences(self, pages):
+        """Yield (sentence, page_number) from a stream of (page_number, text) pages"""
+        return segment_pages(self.spoken_pages(pages))
+
+    def start_sentence_stream(self, sentences):
+        """Read (sentence, page_number) pairs lazily instead of a prepared index"""
+        self.sentences = SentenceIndex()
+        self.word_index = WordIndex()
+        self.sentence_stream = iter(sentences)
+        self.current_sentence_index = 0
+
+    def has_sentence(self, index):
+        """Make sure sentence `index` is loaded, pulling from the stream if needed"""
+        while index >= len(self.sentences) and self.sentence_stream is not None:
+            try:
+                self.sentences.append(*next(self.sentence_stream))
+            except StopIteration:
+                self.sentence_stream = None
+        return index < len(self.sentences)
+
     def speak_sentence(self, sentence):
-        """Speak a single sentence with fresh engine instance"""
+        """Speak a single sentence on the long-lived speech worker"""
         try:
-            # Create fresh engine for each sentence to avoid threading issues
-            engine = self.initialize_engine()
-            if not engine:
+            if not self.start_speech_worker():
                 return False
-            
-            engine.say(sentence)
-            engine.runAndWait()
-            
-            # Clean up engine
-            try:
-                engine.stop()
-                del engine
-            except:
-                pass
-                
-            return True
-            
+
+            return self.speech_worker.speak(sentence)
+
         except Exception as e:
             print(f"❌ Error speaking sentence: {e}")
             return False
 
+    def show_progress(self):
+        """Print the sentence about to be spoken with its position"""
+        more = "+" if self.sentence_stream is not None else ""
+        if self.starts_late():
+            # Sentences before the resumed section are not loaded, so numbers count from its start
+            progress = f"[+{self.current_sentence_index + 1} from p.{self.first_page}]"
+        else:
+            progress = f"[{self.current_sentence_index + 1}/{len(self.sentences)}{more}]"
+        page = self.sentences.page_of(self.current_sentence_index)
+        if page:
+            progress += f" p.{page}"
+        sentence = self.sentences[self.current_sentence_index]
+        print(f"\n{progress} Speaking: {sentence[:80]}{'...' if len(sentence) > 80 else ''}")
+
+    def save_session(self, force=False):
+        """Checkpoint the reading position and speech settings for this document"""
+        if not self.doc_hash or not self.has_sentence(self.current_sentence_index):
+            return
+        index = self.current_sentence_index
+        self.sessions.checkpoint(
+            self.doc_hash,
+            force=force,
+            sentence=index if self.first_page == 1 else None,
+            page=self.sentences.page_of(index),
+            text=self.sentences[index][:80],
+            voice=self.selected_voice,
+            rate=self.rate,
+            volume=self.volume,
+        )
+
+    def load_session(self, file_name):
+        """Saved session for a PDF, with its speech settings applied; None if there is none"""
+        session = self.sessions.get(self.doc_hash) if self.doc_hash else None
+        if not session:
+            print("ℹ️  No saved position for this document, starting from the beginning")
+            return None
+
+        if "rate" not in self.fixed_settings:
+            self.rate = session.get("rate", self.rate)
+        if "volume" not in self.fixed_settings:
+            self.volume = session.get("volume", self.volume)
+        self.selected_voice = session.get("voice") or self.selected_voice
+        self.sync_speech_settings()
+        where = f"page {session['page']}" if session.get("page") else f"sentence {session['sentence'] + 1}"
+        print(f"📌 Resuming {os.path.basename(file_name)} from {where}")
+        return session
+
+    def seek_to_session(self, session):
+        """Index of the saved sentence in the loaded sentences"""
+        saved, page, text = session.get("sentence"), session.get("page"), session.get("text", "")
+        if self.first_page == 1 and saved is not None and self.has_sentence(saved):
+            if self.sentences[saved].startswith(text):
+                return saved
+
+        index = self.sentence_for_page(page) if page else None
+        if index is None:
+            return 0
+        # Sentences are matched by their text in case the page was split differently
+        candidate = index
+        while self.has_sentence(candidate) and self.sentences.page_of(candidate) <= page:
+            if self.sentences[candidate].startswith(text):
+                return candidate
+            candidate += 1
+        return index
+
+    def sentence_for_page(self, page):
+        """First sentence on `page` (or the next page with text), loading pages if needed"""
+        while self.sentences.last_page() < page and self.has_sentence(len(self.sentences)):
+            pass
+        index = self.sentences.first_on_page(page)
+        return index if index < len(self.sentences) else None
+
+    def find_sentence(self, term):
+        """Next sentence after the current one that contains `term`, loading pages as needed"""
+        # The word index is built once, on first use, then extended as sentences stream in
+        after = self.current_sentence_index
+        while True:
+            self.word_index.update(self.sentences)
+            index = self.word_index.find(term, self.sentences, after=after, wrap=False)
+            if index is not None or self.sentence_stream is None:
+                break
+            # Only the new sentences need searching once the next page is in
+            after = max(after, len(self.sentences) - 1)
+            self.sentence_for_page(self.sentences.last_page() + 1)
+        if index is None:
+            # The whole document is loaded, so wrap around to the start
+            index = self.word_index.find(term, self.sentences)
+        return index
+
+    def starts_late(self):
+        """True when reading was resumed past the first selected page, which is not loaded yet"""
+        return self.first_page > (self.page_selection or (1, None))[0]
+
+    def jump_before_section(self, kind, number):
+        """Jump to a page or (absolute) sentence before the resumed section, once it is loaded"""
+        self.pending_reload = (kind, number)
+        print("⏪ Loading the pages before the resumed section...")
+
+    def reload_from_start(self):
+        """Reopen the document from its first selected page and apply the pending jump"""
+        kind, number = self.pending_reload
+        self.pending_reload = None
+        first_page, last_page = self.page_selection or (1, None)
+        try:
+            document = self.prepare_document(self.document_name, first_page, last_page)
+        except Exception as e:
+            print(f"❌ Error reading PDF: {e}")
+            return
+        self.adopt_document(document)
+        if self.lookahead_buffer:
+            self.lookahead_buffer.invalidate()
+        index = self.sentence_for_page(number) if kind == "page" else number
+        if index is None or not self.has_sentence(index):
+            print(f"❌ There is no {kind} {number + 1 if kind == 'sentence' else number}")
+            index = 0
+        self.pending_jump = index
+
+    def restart_from_beginning(self):
+        """Start over at the first selected page, loading it again after a resume"""
+        if self.starts_late():
+            self.jump_before_section("sentence", 0)
+        else:
+            self.pending_jump = 0
+
+    def jump_to(self, index):
+        """Continue reading from sentence `index` once the current sentence is interrupted"""
+        self.pending_jump = index
+        page = self.sentences.page_of(index)
+        where = f" (page {page})" if page else ""
+        print(f"⏩ Jumping to sentence {index + 1}{where}")
+
+    def handle_navigation(self, command):
+        """Handle goto/next/prev/find commands; returns False if not a navigation command"""
+        words = command.split()
+        current_page = self.sentences.page_of(self.current_sentence_index) if len(self.sentences) else 0
+
+        if words[0] in ['find', 'f'] and len(words) > 1:
+            term = " ".join(words[1:])
+            index = self.find_sentence(term)
+            if index is None:
+                print(f"🔍 No match for '{term}'")
+            else:
+                self.jump_to(index)
+
+        elif words[0] == 'goto' and len(words) == 3 and words[2].isdigit():
+            target = int(words[2])
+            if words[1] in ['page', 'p'] and target < self.first_page and self.starts_late():
+                self.jump_before_section("page", target)
+            elif words[1] in ['sentence', 's'] and target >= 1 and self.starts_late():
+                self.jump_before_section("sentence", target - 1)  # numbers count from the first page
+            elif words[1] in ['page', 'p']:
+                index = self.sentence_for_page(target)
+                if index is None:
+                    print(f"❌ No text on page {target} or later")
+                else:
+                    self.jump_to(index)
+            elif words[1] in ['sentence', 's']:
+                if target >= 1 and self.has_sentence(target - 1):
+                    self.jump_to(target - 1)
+                else:
+                    print(f"❌ There is no sentence {target}")
+            else:
+                return False
+
+        elif command in ['next page', 'np', 'prev page', 'pp']:
+            if not current_page:
+                print("❌ Page numbers are not available for this text")
+                return True
+            target = current_page + 1 if command in ['next page', 'np'] else max(1, current_page - 1)
+            if target < self.first_page and self.starts_late():
+                self.jump_before_section("page", target)
+                return True
+            index = self.sentence_for_page(target)
+            if index is None:
+                print("❌ Already on the last page")
+            else:
+                self.jump_to(index)
+
+        else:
+            return False
+        return True
+
     def handle_command(self, command):
         """Handle user commands"""
         if not command:
             return True  # Continue
             
-        if command in ['pause', 'p']:
+        if self.handle_navigation(command):
+            pass
+
+        elif command in ['pause', 'p']:
             self.is_paused = not self.is_paused
             if self.is_paused:
+                self.save_session(force=True)
                 print("⏸️  Paused - type 'pause' or 'p' to resume")
             else:
                 print("▶️  Resumed")
@@ -461,8 +778,16 @@ class ReadMyText:
         elif command in ['quieter', 'down']:
             self.adjust_volume(False)
             
+        elif command in ['next doc', 'nd']:
+            if self.has_next_document():
+                self.skip_document = True
+                self.should_stop = True
+                print("⏭️  Skipping to the next document...")
+            else:
+                print("ℹ️  This is the last document")
+
         elif command in ['restart', 'r']:
-            self.should_restart = True
+            self.restart_from_beginning()
             print("🔄 Restarting from beginning...")
             
         elif command in ['quit', 'q']:
@@ -480,196 +805,756 @@ class ReadMyText:
 
     def speak_text_with_controls(self, text):
         """Main speech function with control handling"""
-        self.current_text = text
         self.prepare_text(text)
+        self.speak_sentences_with_controls()
+
+    def speak_sentences_with_controls(self):
+        """Speak the prepared or streaming sentences, driven by one event queue"""
         self.is_speaking = True
         self.should_stop = False
-        self.should_restart = False
+        self.pending_jump = None
 
         print("🔊 Starting to read...")
         print("💡 Type commands while reading (try 'help' for options)")
         print("-" * 50)
 
-        try:
-            while (self.current_sentence_index < len(self.sentences) and 
-                   not self.should_stop):
-                
-                # Handle restart
-                if self.should_restart:
-                    self.current_sentence_index = 0
-                    self.should_restart = False
-                    print("🔄 Restarted from beginning")
-                    continue
+        if self.lookahead and not self.start_lookahead():
+            self.lookahead = 0
+        if not self.start_speech_worker():
+            print("❌ TTS engine failed to initialize.")
+            self.is_speaking = False
+            return
+        self.start_console_input()
 
-                # Handle pause
-                while self.is_paused and not self.should_stop and not self.should_restart:
-                    print("   ⏸️  [PAUSED] Type 'pause' to resume...")
-                    
-                    # Wait for user input while paused
-                    try:
-                        command = input(">>> ").strip().lower()
-                        if not self.handle_command(command):
-                            return
-                    except KeyboardInterrupt:
-                        self.should_stop = True
-                        break
-                    except:
-                        time.sleep(0.1)
-
-                if self.should_stop or self.should_restart:
-                    continue
+        try:
+            while True:
+                reading_started = time.perf_counter()
+                sentences_read = self.read_until_done()
+                self.finish_utterance()
+                print(f"⏱️  Read {sentences_read} sentences in {time.perf_counter() - reading_started:.1f} s")
+                self.show_latency_report()
 
-                # Show current progress
-                progress = f"[{self.current_sentence_index + 1}/{len(self.sentences)}]"
-                sentence = self.sentences[self.current_sentence_index]
-                
-                print(f"\n{progress} Speaking: {sentence[:80]}{'...' if len(sentence) > 80 else ''}")
-                
-                # Speak the sentence
-                if not self.speak_sentence(sentence):
+                if self.should_stop:
+                    self.save_session(force=True)
+                    print("\n⏭️  Skipped to the next document" if self.skip_document else "\n⏹️  Reading stopped by user")
                     break
 
-                self.current_sentence_index += 1
-                
-                # Check for commands between sentences
-                command = self.get_non_blocking_input()
-                if command is not None:
-                    if not self.handle_command(command):
-                        break
-                
-                # Small pause between sentences
-                time.sleep(0.3)
+                if self.page_selection:
+                    print("\n✅ Finished reading the selected pages!")
+                else:
+                    print("\n✅ Finished reading the entire document!")
+                if self.doc_hash and not self.page_selection:
+                    self.sessions.clear(self.doc_hash)
+                if self.assume_yes or self.has_next_document():
+                    break
 
-            if not self.should_stop:
-                print("\n✅ Finished reading the entire document!")
-                # Ask if user wants to restart
+                # Ask if user wants to restart; the prepared sentences are reused as-is
                 try:
-                    restart_choice = input("\n🔄 Would you like to restart reading? (y/n): ").lower().strip()
-                    if restart_choice in ['y', 'yes']:
-                        print("\n🔄 Restarting from the beginning...")
-                        self.current_sentence_index = 0
-                        self.should_stop = False
-                        self.should_restart = False
-                        # Recursive call to restart reading
-                        self.speak_text_with_controls(self.current_text)
-                    else:
-                        print("👋 Thanks for using the PDF reader!")
-                except KeyboardInterrupt:
+                    restart_choice = self.ask("\n🔄 Would you like to restart reading? (y/n): ").lower().strip()
+                except (KeyboardInterrupt, EOFError):
                     print("\n👋 Goodbye!")
-            else:
-                print("\n⏹️  Reading stopped by user")
+                    break
+                if restart_choice not in ['y', 'yes']:
+                    print("👋 Thanks for using the PDF reader!")
+                    break
+
+                print("\n🔄 Restarting from the beginning...")
+                self.current_sentence_index = 0
+                if self.starts_late():
+                    self.restart_from_beginning()
 
         except KeyboardInterrupt:
+            self.finish_utterance()
+            self.save_session(force=True)
             print("\n🛑 Interrupted by Ctrl+C")
         except Exception as e:
             print(f"\n❌ Error during reading: {e}")
         finally:
             self.is_speaking = False
 
-    def read_pdf_content(self, file_name):
-        """Extract text content from PDF file"""
+    def read_until_done(self):
+        """Event loop: speak sentences and react to commands; returns sentences read"""
+        sentences_read = 0
+        resume_offset = 0
+        next_start = 0.0
+
+        while not self.should_stop:
+            # Handle restart and jumps once the interrupted sentence has wound down
+            if self.pending_reload and self.utterance is None:
+                self.reload_from_start()
+            if self.pending_jump is not None and self.utterance is None:
+                self.current_sentence_index = self.pending_jump
+                if self.pending_jump == 0:
+                    print("🔄 Restarted from beginning")
+                self.pending_jump = None
+                resume_offset = 0
+
+            timeout = 0.5
+            if self.utterance is None and not self.is_paused and self.pending_jump is None:
+                if not self.has_sentence(self.current_sentence_index):
+                    break
+
+                timeout = next_start - time.perf_counter()
+                if timeout <= 0:
+                    if resume_offset == 0:
+                        self.show_progress()
+                    self.start_utterance(self.current_sentence_index, resume_offset)
+                    timeout = 0.5
+
+            event = self.next_event(timeout)
+            if event is None:
+                continue
+
+            if event[0] == "command":
+                with instrumentation.span("command", command=event[1],
+                                          queued_ms=(time.perf_counter() - event[2]) * 1000):
+                    self.handle_command(event[1])
+                    if self.utterance and (self.should_stop or self.pending_jump is not None or self.pending_reload
+                                           or self.is_paused):
+                        self.utterance.cancel()
+                        if self.audio_player:
+                            self.audio_player.stop()
+
+            elif event[0] == "finished":
+                _, utterance, ok = event
+                if utterance is not self.utterance:
+                    continue
+                self.utterance = None
+                chunk = utterance.chunk
+                instrumentation.record("sentence", time.perf_counter() - utterance.started_at,
+                                       index=chunk.index, page=self.sentences.page_of(chunk.index),
+                                       sentences=chunk.end_index - chunk.index, chars=len(chunk.text),
+                                       ok=ok, cancelled=utterance.cancelled)
+
+                if utterance.cancelled:
+                    # Pick up from the interrupted word when resuming from pause
+                    resume_offset = 0
+                    if self.is_paused:
+                        self.current_sentence_index, resume_offset = utterance.resume_position()
+                elif not ok:
+                    break
+                else:
+                    sentences_read += chunk.end_index - chunk.index
+                    self.current_sentence_index, resume_offset = chunk.end_index, chunk.end_offset
+                    self.save_session()
+                    # Small pause between sentences, none within a split sentence; lookahead playback is gapless
+                    gap = 0 if self.lookahead or resume_offset else self.sentence_gap
+                    next_start = time.perf_counter() + gap
+
+        return sentences_read
+
+    def open_pdf_stream(self, file_name, verbose=True, first_page=1, last_page=None):
+        """Open a PDF for lazy page-by-page extraction"""
         try:
             if not os.path.exists(file_name):
                 print(f"❌ File '{file_name}' not found!")
                 return None
 
             print(f"📖 Opening PDF: {file_name}")
-            with open(file_name, "rb") as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                num_pages = len(pdf_reader.pages)
-                print(f"📄 Total pages: {num_pages}")
-
-                full_text = ""
-                for page_num, page in enumerate(pdf_reader.pages):
-                    try:
-                        text = page.extract_text()
-                        if text.strip():
-                            full_text += f"\n{text}\n"
-                        print(f"✅ Processed page {page_num + 1}")
-                    except Exception as e:
-                        print(f"⚠️  Error processing page {page_num + 1}: {e}")
-
-                if not full_text.strip():
-                    print("⚠️  Warning: No text extracted. PDF might be image-based or encrypted.")
-                    return None
-
-                return full_text.strip()
+            pages = PdfPageStream(file_name, verbose=verbose, workers=self.workers,
+                                  first_page=first_page, last_page=last_page, use_mmap=self.use_mmap)
+            print(f"📄 Total pages: {pages.num_pages}")
+            if not pages.whole_document:
+                print(f"📑 Reading pages {pages.page_range.start + 1}-{pages.page_range.stop}")
+            return pages
 
         except Exception as e:
             print(f"❌ Error reading PDF: {e}")
             return None
 
-    def get_file(self):
-        """Get filename from command line arguments"""
-        if len(sys.argv) == 2:
-            filename = sys.argv[1]
-            print(f"📁 Target file: {filename}")
-            return filename
+    def document_hash(self, file_name):
+        """Content hash identifying a PDF across renames, or None if it cannot be read"""
+        try:
+            return self.text_cache.content_hash(file_name)
+        except OSError:
+            return None
+
+    def cache_key_for(self, file_name):
+        """Text cache key for a PDF, or None when caching is off or unavailable"""
+        if not self.use_cache or not os.path.exists(file_name):
+            return None
+        try:
+            return self.text_cache.key_for(file_name)
+        except OSError as e:
+            print(f"⚠️  Text cache unavailable: {e}")
+            return None
+
+    def load_cached_text(self, file_name):
+        """Return (cache key, cached entry or None) for a PDF"""
+        cache_key = self.cache_key_for(file_name)
+        cached = self.text_cache.load(cache_key) if cache_key else None
+        if cached:
+            print(f"⚡ Loaded {len(cached['pages'])} pages from text cache")
+        return cache_key, cached
+
+    def read_pdf_content(self, file_name, first_page=1, last_page=None):
+        """Extract text content from PDF file"""
+        cache_key, cached = self.load_cached_text(file_name)
+        if cached:
+            page_texts = cached["pages"][first_page - 1:last_page]
         else:
-            print("❌ Usage: python myreader.py <filename.pdf>")
+            pages = self.open_pdf_stream(file_name, first_page=first_page, last_page=last_page)
+            if pages is None:
+                return None
+
+            try:
+                page_texts = [text for _, text in pages]
+            except Exception as e:
+                print(f"❌ Error reading PDF: {e}")
+                return None
+
+        # The cache keeps the extracted text; the sentences are built from the normalized text
+        spoken_texts = [text for _, text in self.spoken_pages(enumerate(page_texts, first_page))]
+        if not cached and cache_key and pages.whole_document and not pages.error_pages:
+            sentences = SentenceIndex()
+            for sentence, page in segment_pages(enumerate(spoken_texts, 1)):
+                sentences.append(sentence, page)
+            self.text_cache.store(cache_key, page_texts, sentences.to_dict())
+
+        full_text = "\n\n".join(text for text in spoken_texts if text.strip()).strip()
+        if not full_text:
+            print("⚠️  Warning: No text extracted. PDF might be image-based or encrypted.")
+            return None
+
+        return full_text
+
+    def prepare_document(self, file_name, first_page=1, last_page=None):
+        """Open a PDF (or its cached text) for streaming without touching the current document"""
+        cache_key = self.cache_key_for(file_name)
+        cached = self.text_cache.load(cache_key) if cache_key else None
+        if cached:
+            sentences = select_pages(SentenceIndex.from_dict(cached["sentences"]), first_page, last_page)
+            return PreparedDocument(file_name, len(cached["pages"]), first_page, last_page, sentences,
+                                    from_cache=True)
+
+        pages = PdfPageStream(file_name, verbose=False, workers=self.workers,
+                              first_page=first_page, last_page=last_page, use_mmap=self.use_mmap)
+        document = PreparedDocument(file_name, pages.num_pages, pages.page_range.start + 1, pages.page_range.stop,
+                                    SentenceIndex(), pages=Prefetcher(pages, max_items=self.prefetch_pages))
+        page_texts = []
+
+        def recorded_pages():
+            for page_number, text in document.pages:
+                page_texts.append(text)
+                document.page_bytes += len(text)
+                yield page_number, text
+
+        sentences = self.iter_sentences(recorded_pages())
+        if cache_key and pages.whole_document:
+            sentences = self.cache_completed_stream(sentences, cache_key, page_texts, pages, document.sentences)
+        document.stream = sentences
+        return document
+
+    def adopt_document(self, document):
+        """Make a prepared document the one being read"""
+        self.close_pdf_stream()
+        self.total_pages = document.total_pages
+        self.first_page = document.first_page
+        self.sentences = document.sentences
+        self.sentence_stream = document.stream
+        self.prefetcher = document.pages
+        self.word_index = WordIndex()
+        self.current_sentence_index = 0
+
+    def stream_pdf_sentences(self, file_name, first_page=1, last_page=None):
+        """Start extracting pages in the background and stream their sentences"""
+        document = None
+        if self.document_prefetcher:
+            document = self.document_prefetcher.take(file_name, first_page, last_page)
+        if document is None:
+            if not os.path.exists(file_name):
+                print(f"❌ File '{file_name}' not found!")
+                return False
+            try:
+                document = self.prepare_document(file_name, first_page, last_page)
+            except Exception as e:
+                print(f"❌ Error reading PDF: {e}")
+                return False
+
+        if document.from_cache:
+            print(f"⚡ Loaded {document.total_pages} pages from text cache")
+        else:
+            print(f"📖 Opening PDF: {file_name}")
+            print(f"📄 Total pages: {document.total_pages}")
+            if document.first_page > 1 or document.last_page < document.total_pages:
+                print(f"📑 Reading pages {document.first_page}-{document.last_page}")
+        if self.document_prefetcher and document.sentences and not document.from_cache:
+            print(f"⚡ {len(document.sentences)} sentences were prepared while the previous document played")
+        self.adopt_document(document)
+        return True
+
+    def cache_completed_stream(self, sentences, cache_key, page_texts, pages, index):
+        """Pass sentences through and cache the document once every page was read"""
+        yield from sentences
+
+        # Whoever consumed this stream has appended everything we yielded to index
+        if not pages.error_pages:
+            self.text_cache.store(cache_key, page_texts, index.to_dict())
+
+    def has_next_document(self):
+        """True when the playlist has another document after this one"""
+        return self.playlist_position + 1 < len(self.playlist)
+
+    def prefetch_next_document(self):
+        """Prepare the next playlist document in the background while this one is read"""
+        # Chapters are looked up per document, so their pages are not known in advance
+        if not self.has_next_document() or self.chapter:
+            return
+        if self.document_prefetcher is None:
+            self.document_prefetcher = DocumentPrefetcher(self.prepare_document,
+                                                          self.prefetch_budget_mb * 1024 * 1024)
+        first_page, last_page = self.page_selection or (1, None)
+        self.document_prefetcher.request(self.playlist[self.playlist_position + 1], first_page, last_page)
+
+    def close_pdf_stream(self):
+        """Stop background extraction for the current document"""
+        if self.prefetcher:
+            self.prefetcher.close()
+            self.prefetcher = None
+        self.sentence_stream = None
+
+    def select_chapter(self, file_name):
+        """Limit reading to the pages of an outline chapter; False if it cannot be found"""
+        try:
+            entries, num_pages = load_outline(file_name)
+        except Exception as e:
+            print(f"❌ Error reading PDF outline: {e}")
+            return False
+
+        chapter = find_chapter(entries, num_pages, self.chapter)
+        if chapter is None:
+            if not entries:
+                print("❌ This PDF has no outline (bookmarks) to pick a chapter from")
+            else:
+                print(f"❌ No chapter matching '{self.chapter}'. Chapters in this PDF:")
+                for level, title, page_number in entries:
+                    print(f"   {'  ' * level}{title} (p.{page_number})")
+            return False
+
+        title, first, last = chapter
+        print(f"📑 Chapter '{title}': pages {first}-{last}")
+        self.page_selection = (first, last)
+        return True
+
+    def get_file(self, args):
+        """Get filename and options from the parsed command line arguments"""
+        try:
+            load_backend(args.backend)
+        except (ValueError, ImportError, AttributeError) as e:
+            print(f"❌ {e}")
+            return None
+        self.backend = args.backend
+        self.voice_catalog.backend = args.backend
+        try:
+            instrumentation.enable(args.trace, args.profile)
+        except OSError as e:
+            print(f"⚠️  Unable to open trace file: {e}")
+
+        self.page_selection = args.pages
+        self.chapter = args.chapter
+        self.voice_query = args.voice
+        self.language_query = args.lang
+        self.refresh_voices = args.refresh_voices
+        self.assume_yes = args.yes
+        self.output_path = args.output
+        if args.rate is not None:
+            self.rate = min(max(args.rate, 100), 300)
+            self.fixed_settings.add("rate")
+        if args.volume is not None:
+            self.volume = min(max(args.volume, 0.0), 1.0)
+            self.fixed_settings.add("volume")
+        self.use_cache = not args.no_cache
+        self.use_mmap = args.mmap
+        self.normalize = not args.no_normalize
+        if not self.normalize:
+            self.text_cache.version = lambda: text_cache_version(normalize=False)
+        self.resume = args.resume
+        self.lookahead = max(0, args.lookahead)
+        self.chunker = SpeechChunker(args.chunk_seconds) if args.chunk_seconds > 0 else None
+        if args.clear_cache:
+            removed = self.text_cache.invalidate()
+            print(f"🧹 Cleared {removed} text cache entries")
+            if not args.filenames:
+                return None
+        if args.list_voices:
+            if self.get_available_voices():
+                self.display_voices_grouped()
+            else:
+                print("⚠️  No voices available or unable to detect voices")
+            return None
+        self.extract_only = args.extract_only
+        self.extract_unit = args.extract
+        self.extract_format = args.format
+        if args.search:
+            hit = self.search_corpus(args.search, args.index)
+            if not hit:
+                return None
+            args.filenames = [hit.path]
+            self.start_position = hit.position()
+
+        if not args.filenames:
+            print("❌ Usage: python myreader.py <filename.pdf> [more.pdf | folder | '*.pdf' ...] [--workers N]")
             print("   Example: python myreader.py document.pdf")
             return None
 
-    def run(self):
+        self.playlist = expand_paths(args.filenames)
+        if not self.playlist:
+            print(f"❌ No PDF files match {' '.join(args.filenames)}")
+            return None
+        if len(self.playlist) > 1 and self.output_path and not self.extract_unit:
+            print("❌ --output takes a single PDF; use batch_synth.py to convert several")
+            return None
+        self.prefetch_budget_mb = max(1, args.prefetch_mb)
+
+        self.workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+        filename = self.playlist[0]
+        if len(self.playlist) > 1:
+            print(f"📚 Playlist of {len(self.playlist)} documents:")
+            for number, name in enumerate(self.playlist, 1):
+                print(f"  {number:2d}. {name}")
+        else:
+            print(f"📁 Target file: {filename}")
+        if self.workers > 1:
+            print(f"⚙️  Extracting with {self.workers} worker processes")
+        return filename
+
+    def save_audio(self):
+        """Render the remaining sentences to the --output file instead of playing them"""
+        # Asking for an index past any real document drains the whole stream
+        self.has_sentence(sys.maxsize)
+        start = self.current_sentence_index
+        if not self.start_speech_worker():
+            print("❌ TTS engine failed to initialize.")
+            return False
+        print(f"💾 Rendering {len(self.sentences) - start} sentences to {self.output_path}...")
+
+        started = time.perf_counter()
+        try:
+            seconds = synthesize((self.sentences[i] for i in range(start, len(self.sentences))),
+                                 self.output_path, worker=self.speech_worker)
+        except Exception as e:
+            print(f"❌ Error saving audio: {e}")
+            return False
+
+        if seconds is None:
+            chunk_dir = os.path.splitext(self.output_path)[0]
+            print(f"⚠️  The engine did not produce WAV audio; saved numbered chunk files in {chunk_dir}")
+        else:
+            print(f"✅ Saved {seconds:.1f} s of audio to {self.output_path} "
+                  f"in {time.perf_counter() - started:.1f} s")
+        return True
+
+    def confirm(self, prompt):
+        """Ask a yes/no question; always yes with --yes"""
+        if self.assume_yes:
+            return True
+        return input(prompt).lower() in ["y", "yes"]
+
+    def run(self, argv=None):
         """Main execution method"""
+        args = build_parser().parse_args(argv)
+        if args.extract and args.output in (None, "-"):
+            # The records go to stdout, so every message goes to stderr
+            self.record_output = sys.stdout
+            args.output = None
+            with contextlib.redirect_stdout(sys.stderr):
+                return self.start(args)
+        return self.start(args)
+
+    def start(self, args):
+        """Run with parsed command line arguments"""
         print("🎤 PDF Text-to-Speech Reader with Language-Grouped Voices")
         print("=" * 60)
 
-        filename = self.get_file()
+        filename = self.get_file(args)
         if not filename:
             return
 
-        # Test TTS engine and select voice
-        test_engine = self.initialize_engine()
-        if not test_engine:
-            print("❌ TTS engine failed to initialize. Exiting.")
+        if self.extract_unit:
+            self.export_documents()
             return
-        else:
-            print("✅ TTS engine initialized successfully")
-            try:
-                test_engine.stop()
-                del test_engine
-            except:
-                pass
-
-        # Voice selection with language grouping
-        print("\n🎙️  Voice Selection")
-        if not self.select_voice():
-            print("⚠️  Continuing with default voice")
-
-        text = self.read_pdf_content(filename)
-        if not text:
-            print("❌ No text to read. Exiting.")
+        if self.extract_only:
+            self.extract_documents()
             return
 
-        # Show text preview
-        print(f"\n📝 Text preview (first 200 characters):")
-        print("-" * 50)
-        preview = text[:200].replace('\n', ' ')
-        print(f'"{preview}..."' if len(text) > 200 else f'"{preview}"')
-        print("-" * 50)
+        # The TTS engine starts in the background while voices and the PDF load
+        self.start_speech_worker(wait=False)
+
+        try:
+            for position, filename in enumerate(self.playlist):
+                self.playlist_position = position
+                if position:
+                    print(f"\n📚 Document {position + 1}/{len(self.playlist)}: {filename}")
+                if not self.read_document(filename, first=position == 0):
+                    break
+        finally:
+            if self.document_prefetcher:
+                self.document_prefetcher.close()
+
+    def extract_documents(self):
+        """--extract-only: extract and segment every document into the text cache"""
+        page_selection = self.page_selection
+        for filename in self.playlist:
+            started = time.perf_counter()
+            if self.chapter and not self.select_chapter(filename):
+                continue
+            first_page, last_page = self.page_selection or (1, None)
+            if self.stream_pdf_sentences(filename, first_page=first_page, last_page=last_page):
+                # Draining the stream caches a whole document once its last page is read
+                self.has_sentence(sys.maxsize)
+                print(f"✅ {filename}: {len(self.sentences)} sentences "
+                      f"in {time.perf_counter() - started:.2f} s")
+                self.close_pdf_stream()
+            self.page_selection = page_selection
+
+    def export_documents(self):
+        """--extract: stream every document as page or sentence records"""
+        out = self.record_output
+        started = time.perf_counter()
+        page_selection = self.page_selection
+        documents = records = 0
+        try:
+            if self.output_path:
+                out = open(self.output_path, "w", encoding="utf-8")
+            for filename in self.playlist:
+                if self.chapter and not self.select_chapter(filename):
+                    continue
+                first_page, last_page = self.page_selection or (1, None)
+                self.page_selection = page_selection
+                try:
+                    count, pages = export_document(filename, out, self.extract_unit, self.extract_format,
+                                                   first_page, last_page, self.workers, self.use_mmap,
+                                                   self.normalize)
+                except (BrokenPipeError, KeyboardInterrupt):
+                    raise
+                except Exception as e:
+                    print(f"❌ Error extracting {filename}: {e}")
+                    continue
+                documents += 1
+                records += count
+                print(f"✅ {filename}: {count} {self.extract_unit} from {pages} pages")
+        except BrokenPipeError:
+            # The reader of a pipe stopped early (e.g. `| head`); discard what is still buffered
+            os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+            return
+        except Exception as e:
+            print(f"❌ Error writing records: {e}")
+            return
+        finally:
+            if out is not self.record_output:
+                out.close()
+        print(f"📤 Extracted {records} {self.extract_unit} from {documents} documents "
+              f"in {time.perf_counter() - started:.2f} s")
+
+    def search_corpus(self, query, index_path=None):
+        """Matches for --search from the corpus index; returns the one to read, or None"""
+        from corpus_index import CorpusIndex
+
+        try:
+            with CorpusIndex(index_path) as index:
+                hits = index.search(query, limit=10)
+        except Exception as e:
+            print(f"❌ Unable to search the corpus index: {e}")
+            return None
+        if not hits:
+            print(f"❌ No matches for '{query}' (index folders first: python corpus_index.py FOLDER)")
+            return None
+
+        print(f"🔎 Matches for '{query}':")
+        for number, hit in enumerate(hits, 1):
+            print(f"  {number:2d}. {os.path.basename(hit.path)} p.{hit.page}: {hit.snippet}")
+        if self.assume_yes or len(hits) == 1:
+            return hits[0]
+        while True:
+            choice = input(f"\nRead which match? (1-{len(hits)}, Enter for 1, q to quit): ").strip().lower()
+            if choice in ("q", "quit"):
+                return None
+            if not choice:
+                return hits[0]
+            if choice.isdigit() and 1 <= int(choice) <= len(hits):
+                return hits[int(choice) - 1]
+            print("❌ Invalid choice")
+
+    def choose_voice(self, session=None):
+        """Pick the voice from the options or the menu; False if the options match no voice"""
+        # Voice selection with language grouping; a resumed session keeps its voice
+        if self.voice_query or self.language_query:
+            return self.select_voice_from_options()
+        if self.assume_yes and not session:
+            print("✅ Using default system voice")
+        elif not session:
+            print("\n🎙️  Voice Selection")
+            if not self.select_voice():
+                print("⚠️  Continuing with default voice")
+        return True
+
+    def read_document(self, filename, first=True):
+        """Read one document of the playlist; returns False when the user is done"""
+        page_selection = self.page_selection
+        if self.chapter and not self.select_chapter(filename):
+            return self.has_next_document()
+
+        self.doc_hash = self.document_hash(filename)
+        self.document_name = filename
+        session = self.load_session(filename) if self.resume else None
+        # The voice is chosen once, for the first document of a playlist
+        if first and not self.choose_voice(session):
+            return False
+        position, self.start_position = session or self.start_position, None
+
+        started = time.perf_counter()
+        # Only the selected pages are extracted; resuming or a search match starts at its page
+        first_page, last_page = self.page_selection or (1, None)
+        saved_page = position.get("page") if position else None
+        if saved_page and first_page <= saved_page <= (last_page or saved_page):
+            first_page = saved_page
+        if not self.stream_pdf_sentences(filename, first_page=first_page, last_page=last_page):
+            print("❌ No text to read. Exiting." if not self.has_next_document() else "⏭️  Skipping this document")
+            return self.has_next_document()
 
         try:
-            confirm = input(f"\n🔊 Ready to read {len(text)} characters? (y/n): ").lower()
-            if confirm in ["y", "yes"]:
-                self.show_controls()
-                self.speak_text_with_controls(text)
+            # Pull the first few sentences; extraction keeps running ahead in the background
+            if not self.has_sentence(0):
+                print("⚠️  Warning: No text extracted. PDF might be image-based or encrypted.")
+                print("❌ No text to read. Exiting." if not self.has_next_document() else "⏭️  Skipping this document")
+                return self.has_next_document()
+            if position:
+                self.current_sentence_index = self.seek_to_session(position)
+            start = self.current_sentence_index
+            self.has_sentence(start + 2)
+            print(f"⏱️  First text ready in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+            # Show text preview
+            text = " ".join(self.sentences[start:start + 3])
+            print(f"\n📝 Text preview (first 200 characters):")
+            print("-" * 50)
+            preview = text[:200]
+            print(f'"{preview}..."' if len(text) > 200 or self.sentence_stream else f'"{preview}"')
+            print("-" * 50)
+
+            # The engine has been starting while the PDF was opened
+            if not self.start_speech_worker():
+                print("❌ TTS engine failed to initialize. Exiting.")
+                return False
+
+            if self.page_selection:
+                first_selected, last_selected = self.page_selection
+                scope = (f"pages {first_selected}-{min(last_selected or self.total_pages, self.total_pages)}"
+                         f" of {self.total_pages}")
             else:
-                print("👋 Reading cancelled.")
-                
+                scope = f"{self.total_pages} pages"
+            if self.output_path:
+                if self.confirm(f"\n💾 Save {scope} to {self.output_path}? (y/n): "):
+                    self.save_audio()
+                else:
+                    print("👋 Cancelled.")
+                return False
+
+            # Later documents follow on without asking again
+            if not first or self.confirm(f"\n🔊 Ready to read {scope}? (y/n): "):
+                if first:
+                    self.show_controls()
+                self.prefetch_next_document()
+                self.skip_document = False
+                self.speak_sentences_with_controls()
+                return self.skip_document or not self.should_stop
+            print("👋 Reading cancelled.")
+            return False
+
         except KeyboardInterrupt:
             print("\n👋 Goodbye!")
+            return False
+        finally:
+            self.close_pdf_stream()
+            self.page_selection = page_selection  # --chapter narrows it for one document only
+
+
+def build_parser():
+    """Command line options of the reader"""
+    parser = argparse.ArgumentParser(description="PDF Text-to-Speech Reader")
+    parser.add_argument("filenames", nargs="*", metavar="filename",
+                        help="PDF files, folders or glob patterns to read one after another")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="extract pages with N processes (0 = one per CPU core)")
+    parser.add_argument("--lookahead", type=int, default=0, metavar="N",
+                        help="pre-render the next N utterances for gapless playback")
+    parser.add_argument("--chunk-seconds", type=float, default=6.0, metavar="S",
+                        help="merge short and split long sentences into utterances of about S seconds "
+                             "(0 = one sentence at a time; default 6)")
+    parser.add_argument("--mmap", action="store_true",
+                        help="memory-map the PDF instead of reading it through buffered I/O")
+    parser.add_argument("--prefetch-mb", type=int, default=64, metavar="MB",
+                        help="memory for preparing the next document of a playlist (default 64)")
+    parser.add_argument("--no-normalize", action="store_true",
+                        help="speak the extracted text as is: keep page headers and footers, hyphenation "
+                             "and abbreviations")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always re-extract the PDF instead of using the text cache")
+    parser.add_argument("--clear-cache", action="store_true",
+                        help="delete all cached extracted text")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue from where this document was last left off")
+    parser.add_argument("-y", "--yes", action="store_true",
+                        help="never prompt: use the default or --voice voice and start reading right away")
+    parser.add_argument("-o", "--output", metavar="FILE",
+                        help="save the speech to this WAV file instead of playing it (with --extract: the records file)")
+    parser.add_argument("--rate", type=int, metavar="WPM",
+                        help="speech rate in words per minute (100-300, default 180)")
+    parser.add_argument("--volume", type=float,
+                        help="volume from 0.0 to 1.0 (default 1.0)")
+    parser.add_argument("--voice", metavar="NAME",
+                        help="voice name or id to use, skipping the voice menu")
+    parser.add_argument("--lang", metavar="CODE",
+                        help="use a voice for this language (e.g. en, en_GB, French), skipping the voice menu")
+    parser.add_argument("--list-voices", action="store_true",
+                        help="list the available voices and exit")
+    parser.add_argument("--extract-only", action="store_true",
+                        help="extract the text into the cache without starting a speech engine")
+    parser.add_argument("--extract", choices=UNITS, metavar="UNIT",
+                        help="stream the text as page or sentence records to stdout (or -o FILE) instead of reading")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl",
+                        help="record format for --extract: jsonl (with page numbers and offsets) or text")
+    parser.add_argument("--search", metavar="QUERY",
+                        help="find QUERY in the corpus index (see corpus_index.py) and read from the chosen match")
+    parser.add_argument("--index", metavar="FILE",
+                        help="corpus index for --search (default: the one corpus_index.py writes)")
+    parser.add_argument("--refresh-voices", action="store_true",
+                        help="enumerate system voices again instead of using the saved voice list")
+    parser.add_argument("--pages", type=page_range_argument, metavar="RANGE",
+                        help="only read these pages, e.g. 40-60, 40- or 12")
+    parser.add_argument("--chapter", metavar="TITLE",
+                        help="only read the chapter with this title in the PDF outline")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record timing spans to FILE (.jsonl for JSON lines, otherwise Chrome trace JSON)")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="profile the run with cProfile and save the stats to FILE")
+    parser.add_argument("--backend", default="pyttsx3", metavar="NAME",
+                        help=f"speech backend: {', '.join(BACKENDS)} or module:factory (default: pyttsx3)")
+    return parser
+
+
+def page_range_argument(text):
+    """argparse type for --pages"""
+    try:
+        return parse_page_range(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
 
 
-def main():
+def main(argv=None):
     """Main function"""
+    reader = ReadMyText()
     try:
-        reader = ReadMyText()
-        reader.run()
+        reader.run(argv)
     except KeyboardInterrupt:
         print("\n👋 Program interrupted. Goodbye!")
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
+    finally:
+        reader.sessions.flush()
+        reader.stop_lookahead()
+        reader.stop_speech_worker()
+        instrumentation.disable()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+class WordIndex:
+    """Inverted index from lower-cased words to the sentences that contain them"""
+
+    __slots__ = ("_postings", "indexed")
+
+    def __init__(self):
+        self._postings = {}
+        self.indexed = 0  # sentences [0, indexed) have been added
+
+    def add(self, sentence_id, text):
+        """Index one sentence; ids must be added in increasing order"""
+        for word in set(WORD_PATTERN.findall(text.lower())):
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = array("I")
+            postings.append(sentence_id)
+        self.indexed = sentence_id + 1
+
+    def update(self, sentences):
+        """Index any sentences appended since the last call"""
+        for sentence_id in range(self.indexed, len(sentences)):
+            self.add(sentence_id, sentences[sentence_id])
+
+    def candidates(self, term, after=-1):
+        """Sorted sentence ids after `after` containing every word of `term`"""
+        words = WORD_PATTERN.findall(term.lower())
+        if not words:
+            return array("I")
+        postings = sorted((self._postings.get(word, array("I")) for word in set(words)), key=len)
+        shortest, others = postings[0], postings[1:]
+        # Walk the shortest list and binary-search the others, so a query never copies a posting list
+        positions = [bisect_right(other, after) for other in others]
+        found = array("I")
+        for sentence_id in islice(shortest, bisect_right(shortest, after), None):
+            for n, other in enumerate(others):
+                position = positions[n] = bisect_left(other, sentence_id, positions[n])
+                if position == len(other):
+                    return found
+                if other[position] != sentence_id:
+                    break
+            else:
+                found.append(sentence_id)
+        return found
+
+    def find(self, term, sentences, after=-1, wrap=True):
+        """First sentence after `after` containing `term`, wrapping around if `wrap`; None if absent"""
+        needle = " ".join(term.lower().split())
+        for sentence_id in self.candidates(term, after):
+            if needle in sentences[sentence_id].lower():
+                return sentence_id
+        if wrap and after >= 0:
+            return self.find(term, sentences, wrap=False)
+        return None
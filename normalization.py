@@ -0,0 +1,238 @@
+"""Clean-up of extracted page text before it is split into sentences and spoken
+
+  - ligatures (ﬁ, ﬂ, ...), soft hyphens and no-break spaces are replaced
+  - running headers and footers are removed: short lines at the top or bottom
+    of a page whose shape (case, spacing and digits ignored) recurs at the edge
+    of several pages
+  - words hyphenated across a line or page break are joined, unless the
+    document also writes them with a hyphen mid-line (e.g. "well-known")
+  - abbreviations, units, number ranges and symbols are written out as spoken
+
+Expansions are memoized per matched token, so repeated tokens cost a dict lookup.
+Every pattern starts with a character the regex engine can skip ahead to (a
+hyphen, or the space or bracket in front of a token) instead of trying a match
+at every position, which keeps normalization cheap next to extraction.
+"""
+import functools
+import re
+from collections import deque
+
+import instrumentation
+
+# Bump whenever normalization output changes so cached sentences are rebuilt
+NORMALIZER_VERSION = 1
+
+CHARACTER_MAP = str.maketrans({
+    "ﬀ": "ff", "ﬁ": "fi", "ﬂ": "fl", "ﬃ": "ffi", "ﬄ": "ffl",
+    "ﬅ": "st", "ﬆ": "st", "\u00ad": None, "\u00a0": " ",
+})
+
+ABBREVIATIONS = {
+    "e.g.": "for example", "i.e.": "that is", "etc.": "et cetera", "et al.": "and others",
+    "vs.": "versus", "cf.": "compare", "approx.": "approximately", "ca.": "circa",
+}
+# Only expanded in front of a number, as in "Fig. 3" or "pp. 12-14"
+NUMBERED = {
+    "fig.": "figure", "figs.": "figures", "eq.": "equation", "eqs.": "equations", "no.": "number",
+    "nos.": "numbers", "vol.": "volume", "ch.": "chapter", "sec.": "section", "p.": "page", "pp.": "pages",
+}
+UNITS = {
+    "%": "percent", "km": "kilometres", "cm": "centimetres", "mm": "millimetres", "kg": "kilograms",
+    "mg": "milligrams", "ml": "millilitres", "Hz": "hertz", "kHz": "kilohertz", "MHz": "megahertz",
+    "GHz": "gigahertz", "kW": "kilowatts", "MW": "megawatts", "km/h": "kilometres per hour",
+    "mph": "miles per hour", "°C": "degrees Celsius", "°F": "degrees Fahrenheit",
+}
+SYMBOLS = {"&": "and", "±": "plus or minus", "≈": "approximately", "≤": "at most", "≥": "at least",
+           "×": "times", "→": "to"}
+# Abbreviations that may end a sentence: their full stop is kept in front of a capital
+SENTENCE_FINAL = frozenset({"etc.", "et al."})
+
+
+def _alternation(words):
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+def _trie(words):
+    """Regex matching any of words, branching one character at a time
+
+    At each position the engine then compares one character per distinct first
+    letter instead of trying every word. Case variants are listed as literals
+    because (?i:...) would stop it from rejecting a branch on its first character.
+    """
+    branches = {}
+    for word in words:
+        if word:
+            branches.setdefault(word[0], set()).add(word[1:])
+    alternatives = [re.escape(char) + _trie(rest) for char, rest in sorted(branches.items())]
+    if not alternatives:
+        return ""
+    pattern = alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+    return f"(?:{pattern})?" if "" in words else pattern
+
+
+def _case_variants(words):
+    return {variant for word in words for variant in (word, word[0].upper() + word[1:], word.upper())}
+
+
+RANGE = r"(\d+)\s?[-–—]\s?(\d+)"
+WITH_UNIT = rf"(\d+(?:\.\d+)?)\s?({_alternation(UNITS)})"
+RANGE_PATTERN = re.compile(RANGE)
+UNIT_PATTERN = re.compile(WITH_UNIT)
+# A token counts when it follows a space or an opening bracket or quote (the lead, kept as is).
+# Numbers with a unit and number ranges share their leading digits.
+EXPANSION_PATTERN = re.compile(
+    rf"(?P<lead>[\s(\[{{\"'“‘/])(?P<token>{_trie(_case_variants(ABBREVIATIONS))}"
+    rf"|{_trie(_case_variants(NUMBERED))}(?=\s?\d)"
+    rf"|\d+(?:(?:\.\d+)?\s?(?:{_alternation(UNITS)})(?!\w)|\s?[-–—]\s?\d+(?![\w\-–—]|[.,]\d)))"
+    rf"|[{''.join(SYMBOLS)}]"
+)
+LINE_BREAK_HYPHEN = re.compile(r"-(?<=\w-)[ \t]*\n[ \t]*(\w+)")
+TRAILING_HYPHEN = re.compile(r"(\w+)-\s*$")
+COMPOUND = re.compile(r"-(?<=[^\W\d_]-)([^\W\d_]+)\b")
+LETTERS_BEFORE = re.compile(r"[^\W\d_]+$")
+WORD_BEFORE = re.compile(r"\w+$")
+DIGITS = re.compile(r"\d+")
+WORD = re.compile(r"\w+")
+
+
+@functools.lru_cache(maxsize=4096)
+def expand(token):
+    """Spoken form of a token matched by EXPANSION_PATTERN"""
+    if token in SYMBOLS:
+        return f" {SYMBOLS[token]} "
+    words = ABBREVIATIONS.get(token.lower()) or NUMBERED.get(token.lower())
+    if words:
+        return words.capitalize() if token[0].isupper() else words
+    match = UNIT_PATTERN.fullmatch(token)
+    if match:
+        number, unit = match.groups()
+        words = UNITS[unit]
+        if number == "1":
+            first, space, rest = words.partition(" ")
+            words = first.removesuffix("s") + space + rest
+        return f"{number} {words}"
+    match = RANGE_PATTERN.fullmatch(token)
+    if match:
+        return f"{match.group(1)} to {match.group(2)}"
+    return token
+
+
+def _expand_match(match):
+    lead, token = match.group("lead", "token")
+    if token is None:
+        return expand(match.group())
+    spoken = expand(token)
+    if token.lower() in SENTENCE_FINAL:
+        following = match.string[match.end():match.end() + 2]
+        if not following or (following[0].isspace() and following[1:].isupper()):
+            spoken += "."
+    return lead + spoken
+
+
+def expand_text(text):
+    """Write out the abbreviations, units, ranges and symbols in text"""
+    return EXPANSION_PATTERN.sub(_expand_match, " " + text)[1:]  # the space leads a token at the start
+
+
+def word_before(pattern, text, end, limit=64):
+    """The run of pattern characters that ends at text[end]"""
+    match = pattern.search(text, max(0, end - limit), end)
+    return match.group() if match else ""
+
+
+@functools.lru_cache(maxsize=4096)
+def line_signature(line):
+    """Shape of a line for header/footer matching: case, spacing and digits ignored"""
+    return " ".join(DIGITS.sub("#", line.lower()).split())
+
+
+class TextNormalizer:
+    """Normalizes a stream of (page_number, text) pages for speech
+
+    An edge line is a header or footer once its signature has been seen on
+    min_repeats pages. Pages are held back until `lookahead` more pages have
+    been read, so the first pages are judged with some pages after them; four
+    is enough to catch headers that alternate between odd and even pages.
+    """
+
+    def __init__(self, strip_headers=True, expand=True, min_repeats=3, lookahead=4, edge_lines=2,
+                 max_header_chars=80):
+        self.strip_headers = strip_headers
+        self.expand = expand
+        self.min_repeats = min_repeats
+        self.lookahead = lookahead
+        self.edge_lines = edge_lines
+        self.max_header_chars = max_header_chars
+        self.edge_counts = {}  # signature -> pages it appeared on at the top or bottom
+        self.compounds = set()  # hyphenated words seen mid-line, e.g. "well-known"
+        self.removed_lines = 0
+        self._carry = ""  # first part of a word hyphenated across a page break
+
+    def normalize(self, pages):
+        """Yield normalized (page_number, text) pairs in order"""
+        window = deque()
+        for page_number, text in pages:
+            text = text.translate(CHARACTER_MAP)
+            lines = text.split("\n")
+            edges = self._edges(lines) if self.strip_headers else []
+            for signature in {signature for _, signature in edges}:
+                self.edge_counts[signature] = self.edge_counts.get(signature, 0) + 1
+            if len(self.compounds) < 50000 and "-" in text:
+                self.compounds.update(f"{word_before(LETTERS_BEFORE, text, match.start())}-{match.group(1)}".lower()
+                                      for match in COMPOUND.finditer(text))
+            window.append((page_number, lines, edges))
+            if len(window) > self.lookahead:
+                yield self._finish(*window.popleft(), last=False)
+            if len(self.edge_counts) > 50000:
+                self.edge_counts = {key: count for key, count in self.edge_counts.items() if count > 1}
+        while window:
+            yield self._finish(*window.popleft(), last=not window)
+
+    def _edges(self, lines):
+        """(line number, signature) of the first and last few non-empty, short lines"""
+        filled = [number for number, line in enumerate(lines) if line.strip()]
+        numbers = sorted(set(filled[:self.edge_lines] + filled[-self.edge_lines:]))
+        return [(number, line_signature(lines[number])) for number in numbers
+                if len(lines[number]) <= self.max_header_chars]
+
+    def _finish(self, page_number, lines, edges, last):
+        with instrumentation.span("normalize.page", page=page_number):
+            repeated = {number for number, signature in edges
+                        if self.edge_counts.get(signature, 0) >= self.min_repeats}
+            if repeated:
+                self.removed_lines += len(repeated)
+                lines = [line for number, line in enumerate(lines) if number not in repeated]
+            text = LINE_BREAK_HYPHEN.sub(self._join_hyphenated, "\n".join(lines))
+
+            if self._carry:
+                text = self._continue_word(text)
+            if not last and text.rstrip().endswith("-"):
+                match = TRAILING_HYPHEN.search(text, max(0, len(text.rstrip()) - 64))
+                if match:
+                    self._carry = match.group(1)
+                    text = text[:match.start()]
+            if self.expand:
+                text = expand_text(text)
+        return page_number, text
+
+    def _join_hyphenated(self, match):
+        """Replacement for a hyphen at a line break: nothing, the hyphen, or the match unchanged"""
+        first, second = word_before(WORD_BEFORE, match.string, match.start()), match.group(1)
+        if not (first[-1].isalpha() and second[0].islower()):
+            return match.group()
+        if f"{first}-{second}".lower() in self.compounds:
+            return "-" + second
+        return second
+
+    def _continue_word(self, text):
+        """Prepend the word fragment carried over from the previous page"""
+        carry, self._carry = self._carry, ""
+        rest = text.lstrip()
+        match = WORD.match(rest)
+        second = match.group() if match else ""
+        if not second[:1].islower():
+            return f"{carry}- {text}"
+        if f"{carry}-{second}".lower() in self.compounds:
+            return f"{carry}-{rest}"
+        return carry + rest
+
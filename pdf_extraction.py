@@ -0,0 +1,282 @@
+import mmap
+import queue
+import threading
+import time
+from collections import deque
+
+import instrumentation
+
+# PyPDF2 and the process pool are imported when first needed; importing PyPDF2
+# alone takes longer than the rest of the reader's start-up
+
+
+def extractor_version():
+    """Identifies the text extractor, for cache keys"""
+    import PyPDF2
+
+    return f"PyPDF2-{PyPDF2.__version__}"
+
+
+def open_pdf_input(file_name, use_mmap=False):
+    """Open a PDF for PdfReader, optionally memory-mapped
+
+    A read-only mapping is served straight from the OS page cache, which worker
+    processes opening the same file share. PyPDF2 still copies what it parses,
+    so this is opt-in (see benchmarks/bench_pdf_input.py). Falls back to a
+    regular file where mmap is unavailable (e.g. empty files).
+    """
+    f = open(file_name, "rb")
+    if not use_mmap:
+        return f
+    try:
+        with f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return open(file_name, "rb")
+
+
+def extract_page(reader, page_num):
+    """Extract one page, returning (text, error message or None)"""
+    try:
+        return reader.pages[page_num].extract_text() or "", None
+    except Exception as e:
+        return "", str(e)
+
+
+def timed_extract_page(reader, page_num):
+    """(page_number, text, error, seconds) for a zero-based page number"""
+    started = time.perf_counter()
+    text, error = extract_page(reader, page_num)
+    return page_num + 1, text, error, time.perf_counter() - started
+
+
+def parse_page_range(text):
+    """Parse '40-60', '40-' or '40' into (first, last) page numbers; last may be None"""
+    first, dash, last = text.partition("-")
+    try:
+        first = int(first) if first.strip() else 1
+        last = (int(last) if last.strip() else None) if dash else first
+    except ValueError:
+        raise ValueError(f"invalid page range '{text}' (expected e.g. 40-60)")
+    if first < 1 or (last is not None and last < first):
+        raise ValueError(f"invalid page range '{text}'")
+    return first, last
+
+
+def read_outline(reader):
+    """Flatten the PDF outline (bookmarks) into (level, title, page_number) entries"""
+    entries = []
+
+    def walk(items, level):
+        for item in items:
+            if isinstance(item, list):
+                walk(item, level + 1)  # children of the entry just before
+                continue
+            try:
+                page_number = reader.get_destination_page_number(item) + 1
+            except Exception:
+                continue
+            entries.append((level, (item.title or "").strip(), page_number))
+
+    try:
+        walk(reader.outline, 0)
+    except Exception:
+        return []
+    return entries
+
+
+def load_outline(file_name):
+    """Return (outline entries, number of pages) without extracting any text"""
+    import PyPDF2
+
+    with open_pdf_input(file_name) as f:
+        reader = PyPDF2.PdfReader(f)
+        return read_outline(reader), len(reader.pages)
+
+
+def find_chapter(entries, num_pages, title):
+    """(title, first_page, last_page) of the outline entry best matching `title`, or None"""
+    wanted = title.strip().lower()
+    matches = ([i for i, entry in enumerate(entries) if entry[1].lower() == wanted]
+               or [i for i, entry in enumerate(entries) if entry[1].lower().startswith(wanted)]
+               or [i for i, entry in enumerate(entries) if wanted in entry[1].lower()])
+    if not matches:
+        return None
+
+    position = matches[0]
+    level, found, first = entries[position]
+    last = num_pages
+    # The chapter runs until the next entry at the same or a higher level
+    for next_level, _, page_number in entries[position + 1:]:
+        if next_level <= level and page_number > first:
+            last = page_number - 1
+            break
+    return found, first, last
+
+
+_worker_reader = None
+
+
+def _open_worker_reader(file_name, use_mmap):
+    """Process-pool initializer: each worker opens its own reader once"""
+    import PyPDF2
+
+    global _worker_reader
+    _worker_reader = PyPDF2.PdfReader(open_pdf_input(file_name, use_mmap))
+
+
+def extract_page_range(start, stop):
+    """Process-pool worker: extract pages [start, stop) with this worker's reader"""
+    return [timed_extract_page(_worker_reader, page_num) for page_num in range(start, stop)]
+
+
+class PdfPageStream:
+    """Open a PDF up front and extract its pages lazily, one at a time"""
+
+    def __init__(self, file_name, verbose=True, workers=1, first_page=1, last_page=None, use_mmap=False):
+        import PyPDF2
+
+        self.file_name = file_name
+        self.verbose = verbose
+        self.workers = max(1, workers)
+        self.use_mmap = use_mmap
+        self.error_pages = []
+        with instrumentation.span("pdf.open", file=file_name, mmap=use_mmap) as span:
+            self.file = open_pdf_input(file_name, use_mmap)
+            try:
+                self.reader = PyPDF2.PdfReader(self.file)
+                self.num_pages = len(self.reader.pages)
+            except Exception:
+                self.file.close()
+                raise
+            span.set(pages=self.num_pages)
+        # Zero-based pages to extract; pages outside the range are never decoded
+        stop = self.num_pages if last_page is None else min(last_page, self.num_pages)
+        self.page_range = range(min(max(0, first_page - 1), stop), stop)
+
+    @property
+    def whole_document(self):
+        """True when every page of the PDF is extracted"""
+        return len(self.page_range) == self.num_pages
+
+    def __iter__(self):
+        """Yield (page_number, text) pairs in page order; page numbers start at 1"""
+        try:
+            if self.workers > 1 and len(self.page_range) > 1:
+                results = self._iter_parallel()
+            else:
+                results = self._iter_serial()
+
+            for page_number, text, error, seconds in results:
+                # Timed where the page was extracted, which may be a worker process
+                instrumentation.record("pdf.page", seconds, page=page_number, chars=len(text), error=error)
+                instrumentation.count("pdf.chars", len(text))
+                if error is not None:
+                    self.error_pages.append(page_number)
+                    print(f"⚠️  Error processing page {page_number}: {error}")
+                elif self.verbose:
+                    print(f"✅ Processed page {page_number}")
+                yield page_number, text
+        finally:
+            self.close()
+
+    def _iter_serial(self):
+        for page_num in self.page_range:
+            yield timed_extract_page(self.reader, page_num)
+
+    def _iter_parallel(self):
+        """Extract page ranges across a process pool, reassembling them in order"""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Small chunks keep the first pages arriving quickly and balance uneven pages
+        first, stop = self.page_range.start, self.page_range.stop
+        chunk = max(1, min(16, (stop - first) // (self.workers * 4)))
+        ranges = iter([(start, min(start + chunk, stop)) for start in range(first, stop, chunk)])
+
+        # spawn avoids forking a process that already runs the speech and prefetch threads
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                 initializer=_open_worker_reader,
+                                 initargs=(self.file_name, self.use_mmap)) as pool:
+            pending = deque()
+            try:
+                # Only keep a couple of chunks per worker in flight to bound memory
+                for range_start, range_end in ranges:
+                    pending.append(pool.submit(extract_page_range, range_start, range_end))
+                    if len(pending) >= self.workers * 2:
+                        break
+
+                while pending:
+                    results = pending.popleft().result()
+                    next_range = next(ranges, None)
+                    if next_range:
+                        pending.append(pool.submit(extract_page_range, *next_range))
+                    yield from results
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class Prefetcher:
+    """Run an iterator on a background thread, buffering at most max_items ahead"""
+
+    _DONE = object()
+
+    def __init__(self, iterable, max_items=4):
+        self._source = iter(iterable)
+        self._buffer = queue.Queue(maxsize=max(1, max_items))
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name="prefetcher", daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        """Block until there is room in the buffer or the consumer goes away"""
+        while not self._closed.is_set():
+            try:
+                self._buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        try:
+            for item in self._source:
+                if not self._put((item, None)):
+                    break
+        except Exception as e:
+            self._put((None, e))
+        finally:
+            close = getattr(self._source, "close", None)
+            if close:
+                close()
+            self._put((self._DONE, None))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._closed.is_set():
+            raise StopIteration
+        item, error = self._buffer.get()
+        if error is not None:
+            self.close()
+            raise error
+        if item is self._DONE:
+            self._closed.set()
+            raise StopIteration
+        return item
+
+    def close(self):
+        """Stop the producer and drop anything still buffered"""
+        self._closed.set()
+        try:
+            while True:
+                self._buffer.get_nowait()
+        except queue.Empty:
+            pass
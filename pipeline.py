@@ -0,0 +1,224 @@
+import os
+import shutil
+import tempfile
+import wave
+
+import instrumentation
+from normalization import NORMALIZER_VERSION, TextNormalizer
+from pdf_extraction import PdfPageStream, extractor_version
+from segmenter import SEGMENTER_VERSION, SentenceSegmenter
+from sentence_index import SentenceIndex
+from speech_worker import SpeechWorker
+from tts_backends import create_engine
+
+
+def text_cache_version(normalize=True):
+    """Version for TextCache keys: cached text is reused only with the same extractor, normalizer and segmenter"""
+    version = f"{extractor_version()}/sentences-{SEGMENTER_VERSION}"
+    return f"{version}/normalized-{NORMALIZER_VERSION}" if normalize else version
+
+
+class Document:
+    """The sentences of one PDF (or of a page range of it) with their page numbers"""
+
+    __slots__ = ("file_name", "total_pages", "sentences", "error_pages")
+
+    def __init__(self, file_name, total_pages, sentences, error_pages=()):
+        self.file_name = file_name
+        self.total_pages = total_pages
+        self.sentences = sentences
+        self.error_pages = list(error_pages)
+
+
+def extract_pages(file_name, first_page=1, last_page=None, workers=1, use_mmap=False, verbose=False):
+    """Stage 1: a lazy stream of (page_number, text) for the selected pages
+
+    The returned PdfPageStream also exposes num_pages and, once iterated,
+    error_pages.
+    """
+    return PdfPageStream(file_name, verbose=verbose, workers=workers,
+                         first_page=first_page, last_page=last_page, use_mmap=use_mmap)
+
+
+def normalize_pages(pages, normalizer=None):
+    """Stage 1b: clean up page text for speech (headers, hyphenation, abbreviations; see normalization.py)"""
+    return (normalizer or TextNormalizer()).normalize(pages)
+
+
+def segment_pages(pages, segmenter=None):
+    """Stage 2: yield (sentence, page_number) from a stream of (page_number, text) pages"""
+    segmenter = segmenter or SentenceSegmenter()
+    carried_page = None  # page where the unfinished sentence started
+    for page_number, text in pages:
+        with instrumentation.span("segment.page", page=page_number) as span:
+            sentences = segmenter.feed(text)
+            span.set(sentences=len(sentences))
+        for sentence in sentences:
+            yield sentence, carried_page or page_number
+            carried_page = None
+        if segmenter.pending and carried_page is None:
+            carried_page = page_number
+
+    for sentence in segmenter.flush():
+        yield sentence, carried_page or 0
+
+
+def select_pages(sentences, first_page=1, last_page=None):
+    """The part of a SentenceIndex that starts on pages first_page..last_page"""
+    if first_page <= 1 and last_page is None:
+        return sentences
+    stop = len(sentences) if last_page is None else sentences.first_on_page(last_page + 1)
+    return sentences.section(sentences.first_on_page(first_page), stop)
+
+
+def load_document(file_name, first_page=1, last_page=None, workers=1, use_mmap=False, cache=None, normalize=True):
+    """Extract, normalize and segment a PDF in one go, reusing and filling a TextCache when given
+
+    The cache must be keyed with the same normalize setting (see text_cache_version).
+    """
+    cache_key = cache.key_for(file_name) if cache else None
+    cached = cache.load(cache_key) if cache_key else None
+    if cached:
+        sentences = SentenceIndex.from_dict(cached["sentences"])
+        return Document(file_name, len(cached["pages"]), select_pages(sentences, first_page, last_page))
+
+    pages = extract_pages(file_name, first_page, last_page, workers, use_mmap)
+    page_texts = []
+
+    def recorded_pages():
+        for page_number, text in pages:
+            page_texts.append(text)
+            yield page_number, text
+
+    sentences = SentenceIndex()
+    pages_for_speech = normalize_pages(recorded_pages()) if normalize else recorded_pages()
+    for sentence, page_number in segment_pages(pages_for_speech):
+        sentences.append(sentence, page_number)
+
+    if cache_key and pages.whole_document and not pages.error_pages:
+        cache.store(cache_key, page_texts, sentences.to_dict())
+    return Document(file_name, pages.num_pages, sentences, pages.error_pages)
+
+
+def make_engine(rate=180, volume=1.0, voice=None, backend="pyttsx3"):
+    """A TTS engine of the given backend (see tts_backends) with the given settings"""
+    return create_engine(backend, rate, volume, voice)
+
+
+def start_worker(rate=180, volume=1.0, voice=None, engine_factory=None, backend="pyttsx3"):
+    """A started SpeechWorker, or None if no TTS engine could be created"""
+    worker = SpeechWorker(engine_factory or (lambda: make_engine(rate, volume, voice, backend)))
+    return worker if worker.start() else None
+
+
+def speak(sentences, rate=180, volume=1.0, voice=None, worker=None, on_sentence=None, backend="pyttsx3"):
+    """Stage 3: speak sentences aloud, blocking; returns how many were spoken
+
+    on_sentence(index, sentence) is called before each one; returning False stops.
+    Pass a started `worker` to reuse a warm engine across documents, or a
+    `backend` name such as "null" to run without an audio device.
+    """
+    own_worker = worker is None
+    worker = worker or start_worker(rate, volume, voice, backend=backend)
+    if worker is None:
+        raise RuntimeError("TTS engine failed to initialize")
+
+    spoken = 0
+    try:
+        for index, sentence in enumerate(sentences):
+            if on_sentence and on_sentence(index, sentence) is False:
+                break
+            if not worker.speak(sentence):
+                break
+            spoken += 1
+    finally:
+        if own_worker:
+            worker.stop()
+    return spoken
+
+
+def chunk_sentences(sentences, max_chars=1500):
+    """Group consecutive sentences into chunks of roughly max_chars characters"""
+    chunk = []
+    size = 0
+    for sentence in sentences:
+        if chunk and size + len(sentence) > max_chars:
+            yield " ".join(chunk)
+            chunk = []
+            size = 0
+        chunk.append(sentence)
+        size += len(sentence) + 1
+    if chunk:
+        yield " ".join(chunk)
+
+
+def wav_duration(path):
+    """Length of a WAV file in seconds"""
+    with wave.open(path, "rb") as audio:
+        return audio.getnframes() / float(audio.getframerate())
+
+
+def join_wav_files(paths, out_path, remove_parts=False):
+    """Concatenate WAV files with identical formats; returns total seconds of audio
+
+    With remove_parts each part is deleted as soon as it has been appended. All
+    formats are checked first, so a mismatch raises before any part is removed.
+    """
+    formats = []
+    for path in paths:
+        with wave.open(path, "rb") as part:
+            formats.append(part.getparams())
+    for path, params in zip(paths, formats):
+        if params[:3] != formats[0][:3]:
+            raise wave.Error(f"{path} has a different audio format")
+
+    frames = 0
+    with wave.open(out_path, "wb") as out:
+        if formats:
+            out.setparams(formats[0])
+        for path in paths:
+            with wave.open(path, "rb") as part:
+                out.writeframes(part.readframes(part.getnframes()))
+                frames += part.getnframes()
+            if remove_parts:
+                os.remove(path)
+    return frames / float(formats[0].framerate) if formats else 0.0
+
+
+def synthesize(sentences, output_path, rate=180, volume=1.0, voice=None, worker=None, chunk_chars=1500,
+               backend="pyttsx3"):
+    """Stage 3, offline: render sentences into one WAV file; returns seconds of audio
+
+    Engines that cannot write WAV (e.g. AIFF on macOS) leave numbered chunk
+    files in a directory named after output_path instead; None is returned then.
+    """
+    own_worker = worker is None
+    worker = worker or start_worker(rate, volume, voice, backend=backend)
+    if worker is None:
+        raise RuntimeError("TTS engine failed to initialize")
+
+    work_dir = tempfile.mkdtemp(prefix="pdf-synth-")
+    try:
+        paths = []
+        for index, chunk in enumerate(chunk_sentences(sentences, chunk_chars)):
+            path = os.path.join(work_dir, f"{index:06d}.wav")
+            if not worker.render_to_file(chunk, path):
+                raise RuntimeError(f"synthesis failed for chunk {index}")
+            paths.append(path)
+
+        try:
+            return join_wav_files(paths, output_path)
+        except (wave.Error, EOFError):
+            try:
+                os.remove(output_path)
+            except OSError:
+                pass
+            chunk_dir = os.path.splitext(output_path)[0]
+            os.makedirs(chunk_dir, exist_ok=True)
+            for index, path in enumerate(paths):
+                shutil.move(path, os.path.join(chunk_dir, f"{index:06d}{os.path.splitext(path)[1]}"))
+            return None
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if own_worker:
+            worker.stop()
@@ -0,0 +1,125 @@
+import glob
+import os
+import threading
+
+
+def expand_paths(arguments):
+    """PDF files named by paths, directories (their PDFs) and glob patterns, in order
+
+    Names that match nothing are kept, so the reader can report them as missing.
+    """
+    files = []
+    for argument in arguments:
+        if os.path.isdir(argument):
+            matches = sorted(os.path.join(argument, name) for name in os.listdir(argument)
+                             if name.lower().endswith(".pdf"))
+        elif any(ch in argument for ch in "*?["):
+            matches = sorted(glob.glob(argument, recursive=True))
+        else:
+            matches = [argument]
+        for match in matches:
+            if match not in files:
+                files.append(match)
+    return files
+
+
+class PreparedDocument:
+    """A document opened for reading: the sentences loaded so far and a stream of the rest"""
+
+    __slots__ = ("file_name", "total_pages", "first_page", "last_page", "sentences", "stream",
+                 "pages", "page_bytes", "from_cache")
+
+    def __init__(self, file_name, total_pages, first_page, last_page, sentences, stream=None,
+                 pages=None, from_cache=False):
+        self.file_name = file_name
+        self.total_pages = total_pages
+        self.first_page = first_page  # first page actually extracted
+        self.last_page = last_page
+        self.sentences = sentences
+        self.stream = stream  # remaining (sentence, page_number) pairs, None when complete
+        self.pages = pages    # background page Prefetcher feeding the stream
+        self.page_bytes = 0   # page texts held for the text cache until the document completes
+        self.from_cache = from_cache
+
+    def nbytes(self):
+        """Approximate memory held by the loaded part of the document"""
+        return self.sentences.nbytes() + self.page_bytes
+
+    def close(self):
+        """Stop background extraction for this document"""
+        if self.pages:
+            self.pages.close()
+            self.pages = None
+        self.stream = None
+
+
+class DocumentPrefetcher:
+    """Prepares the next playlist document on a background thread within a memory budget
+
+    prepare(file_name, first_page, last_page) returns a PreparedDocument; its
+    stream is then pulled into its sentence index until the document is complete
+    or holds budget_bytes, and the rest is left to stream on demand.
+    """
+
+    def __init__(self, prepare, budget_bytes=64 * 1024 * 1024):
+        self.prepare = prepare
+        self.budget_bytes = budget_bytes
+        self._key = None
+        self._document = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def request(self, file_name, first_page=1, last_page=None):
+        """Start preparing a document, replacing any earlier request"""
+        self.cancel()
+        self._key = (file_name, first_page, last_page)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._load, args=(self._key, self._stop),
+                                        name="document-prefetch", daemon=True)
+        self._thread.start()
+
+    def take(self, file_name, first_page=1, last_page=None):
+        """The prepared document if it was requested with these arguments, else None"""
+        if self._key != (file_name, first_page, last_page):
+            self.cancel()
+            return None
+
+        # Stop filling ahead; whatever is not loaded yet streams from here on
+        self._stop.set()
+        self._thread.join()
+        document = self._document
+        self._key = self._document = self._thread = None
+        return document
+
+    def cancel(self):
+        """Drop the pending document and stop its background work"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+        if self._document is not None:
+            self._document.close()
+        self._key = self._document = self._thread = None
+
+    close = cancel
+
+    def _load(self, key, stop):
+        try:
+            document = self.prepare(*key)
+        except Exception:
+            return  # opened again, with the error reported, when it is its turn
+
+        while document.stream is not None and not stop.is_set() and document.nbytes() < self.budget_bytes:
+            try:
+                document.sentences.append(*next(document.stream))
+            except StopIteration:
+                document.stream = None
+            except Exception:
+                # The stream that raised is finished, so this document would just end early:
+                # drop it and let the reader open it again, reporting the error
+                document.close()
+                return
+
+        if document.from_cache and document.nbytes() > self.budget_bytes:
+            # A large cached document: cheap to load again when its turn comes
+            document = None
+        self._document = document
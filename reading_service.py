@@ -0,0 +1,601 @@
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import uuid
+import wave
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from batch_synth import init_worker, render_chunk_with, warm_up
+from pdf_extraction import parse_page_range
+from pipeline import chunk_sentences, load_document, text_cache_version
+from text_cache import TextCache
+from tts_backends import load_backend
+
+
+def wav_stream_header(channels, sample_width, framerate):
+    """WAV header for a stream of unknown length (sizes set to the maximum)"""
+    byte_rate = framerate * channels * sample_width
+    return (b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVEfmt "
+            + struct.pack("<IHHIIHH", 16, 1, channels, framerate, byte_rate,
+                          channels * sample_width, sample_width * 8)
+            + b"data" + struct.pack("<I", 0xFFFFFFFF))
+
+
+class Metrics:
+    """Counters and gauges rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, value=1):
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + value
+
+    def set(self, name, value):
+        with self._lock:
+            self._values[name] = value
+
+    def render(self, gauges=None):
+        with self._lock:
+            values = dict(self._values)
+        values.update(gauges or {})
+        # Integers exactly and floats at full precision: byte counters must not be rounded
+        return "".join(f"pdf_reader_{name} {value if isinstance(value, int) else repr(float(value))}\n"
+                       for name, value in sorted(values.items()))
+
+
+class ReadingJob:
+    """One uploaded PDF being extracted and synthesized
+
+    Audio is spooled to a PCM file next to the upload, so memory holds only the
+    chunk offsets however long the document is. The file is removed by
+    release_audio() once the audio has been streamed or has expired.
+    """
+
+    def __init__(self, pdf_path, settings, first_page=1, last_page=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.pdf_path = pdf_path
+        self.audio_path = os.path.splitext(pdf_path)[0] + ".pcm"
+        self.settings = settings
+        self.first_page = first_page
+        self.last_page = last_page
+        self.state = "queued"
+        self.error = None
+        self.pages = None
+        self.sentences = None
+        self.audio_params = None  # (channels, sample_width, framerate) of the first chunk
+        self.chunks = []          # (offset, length) of each chunk in the audio file
+        self.audio_bytes = 0
+        self.audio_seconds = 0.0
+        self.audio_released = False
+        self.readers = 0          # streams currently sending this job's audio
+        self.cancelled = False
+        self.created = time.time()
+        self.finished = None
+        self._cond = threading.Condition()
+
+    @property
+    def done(self):
+        return self.state in ("finished", "failed", "cancelled")
+
+    def add_chunk(self, params, frames):
+        with self._cond:
+            if self.audio_params is None:
+                self.audio_params = params
+            elif params != self.audio_params:
+                raise wave.Error("engine changed audio format between chunks")
+            if self.audio_released:
+                return  # nobody can stream it any more
+            with open(self.audio_path, "ab") as f:
+                f.write(frames)
+            self.chunks.append((self.audio_bytes, len(frames)))
+            self.audio_bytes += len(frames)
+            self.audio_seconds += len(frames) / float(params[0] * params[1] * params[2])
+            self._cond.notify_all()
+
+    def finish(self, state, error=None):
+        with self._cond:
+            self.state = state
+            self.error = error
+            self.finished = time.time()
+            self._cond.notify_all()
+
+    def wait_chunk(self, index, timeout=1.0):
+        """Chunk number `index` once produced; None if the job ended or nothing arrived yet"""
+        with self._cond:
+            if index >= len(self.chunks) and not self.done:
+                self._cond.wait(timeout)
+            if index >= len(self.chunks) or self.audio_released:
+                return None
+            offset, length = self.chunks[index]
+        try:
+            with open(self.audio_path, "rb") as f:
+                f.seek(offset)
+                return f.read(length)
+        except OSError:
+            return None  # released while we were reading
+
+    def open_reader(self):
+        """Register a stream; False if the audio has already been released"""
+        with self._cond:
+            if self.audio_released:
+                return False
+            self.readers += 1
+            return True
+
+    def close_reader(self, complete):
+        """Unregister a stream; audio that was streamed to the end is released (returns bytes freed)"""
+        with self._cond:
+            self.readers -= 1
+        return self.release_audio() if complete and self.done else 0
+
+    def release_audio(self, force=False):
+        """Delete the spooled audio unless a stream is still reading it; returns bytes freed"""
+        with self._cond:
+            if self.audio_released or (self.readers and not force):
+                return 0
+            self.audio_released = True
+            freed = self.audio_bytes
+        try:
+            os.remove(self.audio_path)
+        except OSError:
+            pass
+        return freed
+
+    @property
+    def buffered_bytes(self):
+        return 0 if self.audio_released else self.audio_bytes
+
+    def wait_started(self, timeout=1.0):
+        """Wait until audio format is known or the job has ended"""
+        with self._cond:
+            if self.audio_params is None and not self.done:
+                self._cond.wait(timeout)
+            return self.audio_params is not None or self.done
+
+    def status(self):
+        return {
+            "id": self.id,
+            "state": self.state,
+            "error": self.error,
+            "pages": self.pages,
+            "sentences": self.sentences,
+            "chunks": len(self.chunks),
+            "audio_seconds": round(self.audio_seconds, 3),
+            "audio_released": self.audio_released,
+        }
+
+
+class ReadingService:
+    """Local HTTP service: PDF uploads are queued and read by a pool of warm TTS engines
+
+    Each engine lives in its own process (pyttsx3 shares one engine per process),
+    started once with the service and reused for every job.
+
+    POST /jobs (PDF as the request body; optional ?rate=&volume=&voice=&pages=)
+    GET /jobs/<id>, GET /jobs/<id>/audio (chunked WAV, streamed while synthesizing),
+    DELETE /jobs/<id>, GET /metrics, GET /health
+
+    A job's audio is kept on disk until it has been streamed to the end, or for
+    audio_ttl seconds after the job finished if nobody streams it.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, engines=2, max_queue=8, max_streams=16,
+                 max_upload_mb=100, chunk_chars=1500, keep_jobs=16, audio_ttl=600, backend="pyttsx3",
+                 rate=180, volume=1.0, voice=None):
+        load_backend(backend)  # fail early on a bad backend name
+        self.backend = backend
+        self.engine_count = max(1, engines)
+        self.defaults = {"rate": rate, "volume": volume, "voice": voice}
+        self.max_upload = max_upload_mb * 1024 * 1024
+        self.chunk_chars = chunk_chars
+        self.keep_jobs = keep_jobs
+        self.audio_ttl = audio_ttl
+        self.metrics = Metrics()
+        self.text_cache = TextCache(version=text_cache_version)
+        self.jobs = {}
+        self._jobs_lock = threading.Lock()
+        # Bounded queue: uploads beyond it are refused with 503 instead of piling up
+        self._queue = queue.Queue(maxsize=max(1, max_queue))
+        self._streams = threading.BoundedSemaphore(max(1, max_streams))
+        self._pool = None
+        self._threads = []
+        self._work_dir = tempfile.mkdtemp(prefix="pdf-reader-service-")
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._server_thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Start the engines (once) and serve requests on a background thread"""
+        started = time.perf_counter()
+        # spawn avoids forking a process that already runs the HTTP and job threads
+        self._pool = ProcessPoolExecutor(max_workers=self.engine_count,
+                                         mp_context=multiprocessing.get_context("spawn"),
+                                         initializer=init_worker,
+                                         initargs=(self.backend, self.defaults))
+        try:
+            # Make every engine process start now rather than on the first upload
+            for future in [self._pool.submit(warm_up) for _ in range(self.engine_count)]:
+                future.result()
+        except Exception as e:
+            self._pool.shutdown(cancel_futures=True)
+            raise RuntimeError(f"TTS engine failed to initialize: {e}")
+        self.metrics.set("engine_startup_seconds", time.perf_counter() - started)
+
+        # One job thread per engine keeps at most `engines` documents in synthesis
+        for number in range(self.engine_count):
+            thread = threading.Thread(target=self._run_jobs, name=f"jobs-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        self._server_thread = threading.Thread(target=self._server.serve_forever, name="http", daemon=True)
+        self._server_thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving, finish the current chunks and release the engines"""
+        self._server.shutdown()
+        self._server.server_close()
+        with self._jobs_lock:
+            for job in self.jobs.values():
+                job.cancelled = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(10)
+        if self._pool:
+            self._pool.shutdown(cancel_futures=True)
+        shutil.rmtree(self._work_dir, ignore_errors=True)
+
+    def submit(self, pdf_bytes, settings, first_page=1, last_page=None):
+        """Queue a PDF; returns the job, or None when the queue is full"""
+        fd, pdf_path = tempfile.mkstemp(dir=self._work_dir, suffix=".pdf")
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_bytes)
+
+        job = ReadingJob(pdf_path, settings, first_page, last_page)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            os.remove(pdf_path)
+            self.metrics.add("jobs_rejected_total")
+            return None
+
+        with self._jobs_lock:
+            self.jobs[job.id] = job
+            self._forget_old_jobs()
+        self.metrics.add("jobs_submitted_total")
+        return job
+
+    def get_job(self, job_id):
+        with self._jobs_lock:
+            self._expire_audio()
+            return self.jobs.get(job_id)
+
+    def _forget_old_jobs(self):
+        finished = sorted((job for job in self.jobs.values() if job.done), key=lambda job: job.finished)
+        for job in finished[:max(0, len(finished) - self.keep_jobs)]:
+            self.metrics.add("audio_released_bytes_total", job.release_audio(force=True))
+            del self.jobs[job.id]
+
+    def _expire_audio(self):
+        """Release the audio of jobs that finished more than audio_ttl seconds ago"""
+        now = time.time()
+        for job in self.jobs.values():
+            if job.done and not job.audio_released and now - job.finished > self.audio_ttl:
+                self.metrics.add("audio_released_bytes_total", job.release_audio())
+
+    def metrics_text(self):
+        with self._jobs_lock:
+            self._expire_audio()
+            active = sum(1 for job in self.jobs.values() if job.state in ("extracting", "synthesizing"))
+            buffered = sum(job.buffered_bytes for job in self.jobs.values())
+        return self.metrics.render({
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "jobs_active": active,
+            "audio_buffered_bytes": buffered,
+            "engines": self.engine_count if self._pool else 0,
+        })
+
+    def open_stream(self):
+        """Reserve one of the concurrent audio streams; False when all are in use"""
+        if not self._streams.acquire(blocking=False):
+            self.metrics.add("streams_rejected_total")
+            return False
+        self.metrics.add("streams_active")
+        return True
+
+    def close_stream(self):
+        self.metrics.add("streams_active", -1)
+        self._streams.release()
+
+    def _run_jobs(self):
+        """Job thread: take queued jobs one at a time and feed their chunks to the engines"""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            job_dir = tempfile.mkdtemp(dir=self._work_dir)
+            try:
+                self._process(job, job_dir)
+            except Exception as e:
+                job.finish("failed", str(e))
+                self.metrics.add("jobs_failed_total")
+            finally:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                try:
+                    os.remove(job.pdf_path)
+                except OSError:
+                    pass
+                if job.state != "finished":
+                    job.release_audio()  # failed or cancelled: nobody needs the rest
+
+    def _process(self, job, job_dir):
+        if job.cancelled:
+            job.finish("cancelled")
+            return
+
+        job.state = "extracting"
+        started = time.perf_counter()
+        document = load_document(job.pdf_path, job.first_page, job.last_page, cache=self.text_cache)
+        self.metrics.add("extraction_seconds_total", time.perf_counter() - started)
+        job.pages = min(job.last_page or document.total_pages, document.total_pages) - job.first_page + 1
+        job.sentences = len(document.sentences)
+        self.metrics.add("pages_total", max(0, job.pages))
+        if not job.sentences:
+            raise ValueError("no text extracted; the PDF might be image-based or encrypted")
+
+        job.state = "synthesizing"
+        started = time.perf_counter()
+        chunks = enumerate(chunk_sentences(document.sentences, self.chunk_chars))
+        pending = deque()
+        try:
+            while True:
+                # Two chunks in flight: the next one renders while this one is streamed
+                while len(pending) < 2:
+                    item = next(chunks, None)
+                    if item is None:
+                        break
+                    index, text = item
+                    path = os.path.join(job_dir, f"{index:06d}.wav")
+                    pending.append(self._pool.submit(render_chunk_with, self.backend, job.settings, text, path))
+                if not pending:
+                    break
+                if job.cancelled:
+                    job.finish("cancelled")
+                    return
+
+                path, _ = pending.popleft().result()
+                try:
+                    with wave.open(path, "rb") as audio:
+                        params = (audio.getnchannels(), audio.getsampwidth(), audio.getframerate())
+                        frames = audio.readframes(audio.getnframes())
+                except (wave.Error, EOFError):
+                    raise RuntimeError("the TTS engine did not produce WAV audio")
+                os.remove(path)
+                job.add_chunk(params, frames)
+                self.metrics.add("chunks_synthesized_total")
+        finally:
+            for future in pending:
+                future.cancel()
+            wait(pending)
+
+        self.metrics.add("synthesis_seconds_total", time.perf_counter() - started)
+        self.metrics.add("audio_seconds_total", job.audio_seconds)
+        self.metrics.add("jobs_completed_total")
+        job.finish("finished")
+
+    def _handler_class(self):
+        service = self
+
+        class Handler(ServiceRequestHandler):
+            pass
+
+        Handler.service = service
+        return Handler
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a ReadingService"""
+
+    protocol_version = "HTTP/1.1"  # needed for chunked audio streaming
+    service = None
+
+    def log_message(self, format, *args):
+        pass  # keep the console quiet; /metrics has the numbers
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def route(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        return parts, parse_qs(url.query)
+
+    def do_GET(self):
+        parts, _ = self.route()
+        if parts == ["health"]:
+            self.send_json(200, {"ok": True})
+        elif parts == ["metrics"]:
+            body = self.service.metrics_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.service.get_job(parts[1])
+            if job is None:
+                self.send_json(404, {"error": "unknown job"})
+            elif len(parts) == 2:
+                self.send_json(200, job.status())
+            elif parts[2] == "audio":
+                self.stream_audio(job)
+            else:
+                self.send_json(404, {"error": "not found"})
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        parts, query = self.route()
+        if parts != ["jobs"]:
+            self.send_json(404, {"error": "not found"})
+            return
+
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self.send_json(411, {"error": "Content-Length required"})
+            return
+        try:
+            length = int(length)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            self.send_json(400, {"error": "invalid Content-Length"})
+            self.close_connection = True
+            return
+        if length > self.service.max_upload:
+            self.send_json(413, {"error": f"upload larger than {self.service.max_upload} bytes"})
+            self.close_connection = True
+            return
+        pdf_bytes = self.rfile.read(length)
+
+        try:
+            settings = dict(self.service.defaults)
+            if "rate" in query:
+                settings["rate"] = min(max(int(query["rate"][0]), 100), 300)
+            if "volume" in query:
+                settings["volume"] = min(max(float(query["volume"][0]), 0.0), 1.0)
+            if "voice" in query:
+                settings["voice"] = query["voice"][0]
+            first_page, last_page = parse_page_range(query["pages"][0]) if "pages" in query else (1, None)
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+            return
+
+        job = self.service.submit(pdf_bytes, settings, first_page, last_page)
+        if job is None:
+            self.send_json(503, {"error": "too many queued jobs, retry later"}, {"Retry-After": "5"})
+            return
+        self.send_json(202, job.status(), {"Location": f"/jobs/{job.id}"})
+
+    def do_DELETE(self):
+        parts, _ = self.route()
+        job = self.service.get_job(parts[1]) if len(parts) == 2 and parts[0] == "jobs" else None
+        if job is None:
+            self.send_json(404, {"error": "unknown job"})
+            return
+        job.cancelled = True
+        self.send_json(200, job.status())
+
+    def write_chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def stream_audio(self, job):
+        """Send the job's audio as one WAV stream, chunk by chunk as it is synthesized"""
+        if not job.open_reader():
+            self.send_json(410, {"error": "audio was already streamed or has expired"})
+            return
+        if not self.service.open_stream():
+            job.close_reader(complete=False)
+            self.send_json(503, {"error": "too many audio streams"}, {"Retry-After": "5"})
+            return
+        complete = False
+        try:
+            while not job.wait_started():
+                pass
+            if job.audio_params is None:
+                self.send_json(409 if job.state == "cancelled" else 500, job.status())
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/wav")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self.write_chunk(wav_stream_header(*job.audio_params))
+
+            index = 0
+            while True:
+                data = job.wait_chunk(index)
+                if data is not None:
+                    self.write_chunk(data)
+                    index += 1
+                elif job.audio_released or (job.done and index >= len(job.chunks)):
+                    break
+            self.wfile.write(b"0\r\n\r\n")
+            complete = job.state == "finished"
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        finally:
+            self.service.close_stream()
+            self.service.metrics.add("audio_released_bytes_total", job.close_reader(complete))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP service that reads PDFs aloud to audio streams")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--engines", type=int, default=2, help="warm TTS engines, i.e. jobs synthesized at once")
+    parser.add_argument("--max-queue", type=int, default=8, help="queued jobs before uploads get 503")
+    parser.add_argument("--max-streams", type=int, default=16, help="concurrent audio downloads")
+    parser.add_argument("--max-upload-mb", type=int, default=100)
+    parser.add_argument("--chunk-chars", type=int, default=1500,
+                        help="approximate characters per streamed audio chunk")
+    parser.add_argument("--audio-ttl", type=int, default=600, metavar="SECONDS",
+                        help="delete audio nobody has streamed this long after its job finished")
+    parser.add_argument("--rate", type=int, default=180, help="default speech rate in WPM")
+    parser.add_argument("--volume", type=float, default=1.0, help="default volume from 0.0 to 1.0")
+    parser.add_argument("--voice", help="default voice id")
+    parser.add_argument("--backend", default="pyttsx3",
+                        help="pyttsx3, espeak, null or module:factory, as for the reader")
+    args = parser.parse_args()
+
+    try:
+        service = ReadingService(
+            args.host, args.port, engines=args.engines, max_queue=args.max_queue,
+            max_streams=args.max_streams, max_upload_mb=args.max_upload_mb, chunk_chars=args.chunk_chars,
+            audio_ttl=args.audio_ttl,
+            rate=args.rate, volume=args.volume, voice=args.voice, backend=args.backend,
+        )
+        service.start()
+    except (RuntimeError, ValueError, ImportError, OSError) as e:
+        print(f"❌ {e}")
+        return
+    print(f"🌐 Serving on {service.url} with {args.engines} engines (Ctrl+C to stop)")
+    print(f"   curl --data-binary @doc.pdf {service.url}/jobs")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down...")
+    finally:
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()
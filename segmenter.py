@@ -0,0 +1,116 @@
+import re
+
+# Bump whenever segmentation output changes so cached sentence lists are rebuilt
+SEGMENTER_VERSION = 3
+
+# Never the last word of a sentence
+ABBREVIATIONS = frozenset({
+    "e.g", "i.e", "etc", "vs", "cf", "approx", "viz",
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "rev", "hon", "capt", "lt",
+    "fig", "figs", "eq", "eqs", "nos", "vol", "vols", "pp", "ref", "refs",
+    "eds", "ibid", "inc", "ltd", "corp", "dept", "univ",
+})
+# Also ordinary words ("He said no."): only abbreviations in front of a number, as in
+# "No. 5", "p. 12" or "Dec. 3" (a following lowercase word never ends a sentence anyway)
+NUMBERED_ABBREVIATIONS = frozenset({
+    "no", "p", "ch", "sec", "st", "gen", "col", "op", "ed", "co", "est", "ca",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+    "mon", "tue", "wed", "thu", "fri", "sat", "sun",
+})
+
+# A run of terminal punctuation (plus closing quotes/brackets) followed by whitespace.
+# Only these candidates are inspected, so the scan stays linear in the text length.
+BOUNDARY_PATTERN = re.compile(r'([.!?]+)["\'\)\]”’]*(?= )')
+HAS_CONTENT_PATTERN = re.compile(r'\w')
+OPENING_PUNCTUATION = "([{\"'“‘"
+
+
+class SentenceSegmenter:
+    """Incremental, abbreviation- and number-aware sentence splitter"""
+
+    def __init__(self, abbreviations=ABBREVIATIONS, numbered_abbreviations=NUMBERED_ABBREVIATIONS,
+                 max_chars=5000):
+        self.abbreviations = abbreviations
+        self.numbered_abbreviations = numbered_abbreviations
+        self.max_chars = max_chars
+        self._tail = ""
+
+    def is_boundary(self, text, position, punctuation, end):
+        """Decide whether a run of dots at `position` really ends a sentence"""
+        if punctuation == ".":
+            # Abbreviations are short, so only look a little way back for the word
+            lower_bound = max(0, position - 32)
+            space = text.rfind(" ", lower_bound, position)
+            word = text[space + 1 if space >= 0 else lower_bound:position]
+            word = word.lstrip(OPENING_PUNCTUATION).lower()
+            if word in self.abbreviations:
+                return False
+            if word in self.numbered_abbreviations and text[end + 1:end + 2].isdigit():
+                return False
+            if word == "al" and text[max(0, position - 6):position].lower().endswith("et al"):
+                return False  # "et al." is usually followed by a name or a year in brackets
+            if len(word) == 1 and word.isalpha():
+                return False  # initials such as "J. Smith"
+            if "." in word and word.replace(".", "").isalpha():
+                return False  # dotted acronyms such as "U.S." or "a.m."
+
+        if text[end + 1:end + 2].islower():
+            return False  # "approx. five" - the sentence clearly continues
+        return True
+
+    def feed(self, text):
+        """Add text (e.g. one page) and return the sentences it completes"""
+        # Normalising whitespace once per page lets sentences be plain slices
+        text = " ".join(text.split())
+        if not text:
+            return []
+        if self._tail:
+            text = f"{self._tail} {text}"
+
+        sentences = []
+        start = 0
+        for match in BOUNDARY_PATTERN.finditer(text):
+            punctuation = match.group(1)
+            end = match.end()
+            # '!' and '?' always end a sentence; dots need a closer look
+            if punctuation.strip(".") or self.is_boundary(text, match.start(), punctuation, end):
+                self._emit(text, start, end, sentences)
+                start = end
+
+        self._tail = text[start:]
+        while len(self._tail) > self.max_chars:
+            # No sentence end for a very long stretch: break at the last space
+            cut = self._tail.rfind(" ", 0, self.max_chars)
+            cut = cut if cut > 0 else self.max_chars
+            self._emit(self._tail, 0, cut, sentences)
+            self._tail = self._tail[cut:]
+        return sentences
+
+    @property
+    def pending(self):
+        """True while an unfinished sentence is carried over to the next feed"""
+        return bool(self._tail)
+
+    def flush(self):
+        """Return whatever is left as a final sentence"""
+        sentences = []
+        self._emit(self._tail, 0, len(self._tail), sentences)
+        self._tail = ""
+        return sentences
+
+    def segment(self, text):
+        """Split a complete text into sentences"""
+        return self.feed(text) + self.flush()
+
+    def _emit(self, text, start, end, sentences):
+        sentence = text[start:end].strip()
+        if HAS_CONTENT_PATTERN.search(sentence):
+            sentences.append(sentence)
+
+
+def iter_sentences(texts, segmenter=None):
+    """Yield sentences from an iterable of text chunks such as pages"""
+    segmenter = segmenter or SentenceSegmenter()
+    for text in texts:
+        yield from segmenter.feed(text)
+    yield from segmenter.flush()
@@ -0,0 +1,81 @@
+from array import array
+from bisect import bisect_left
+
+
+class SentenceIndex:
+    """Sentences kept in one UTF-8 buffer with array-backed offsets and page numbers
+
+    Sentence i is buffer[offsets[i]:offsets[i + 1]]; pages[i] is the page it starts
+    on (0 when unknown). Behaves like a read-only list of strings.
+    """
+
+    __slots__ = ("_buffer", "_offsets", "_pages")
+
+    def __init__(self, sentences=(), page=0):
+        self._buffer = bytearray()
+        self._offsets = array("Q", [0])
+        self._pages = array("I")
+        for sentence in sentences:
+            self.append(sentence, page)
+
+    def append(self, sentence, page=0):
+        self._buffer += sentence.encode("utf-8")
+        self._offsets.append(len(self._buffer))
+        self._pages.append(page)
+
+    def __len__(self):
+        return len(self._pages)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("sentence index out of range")
+        return self._buffer[self._offsets[index]:self._offsets[index + 1]].decode("utf-8")
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def page_of(self, index):
+        """Page number a sentence starts on (0 when unknown)"""
+        return self._pages[index]
+
+    def first_on_page(self, page):
+        """Index of the first sentence on `page` or a later page (len(self) if none)"""
+        return bisect_left(self._pages, page)
+
+    def last_page(self):
+        return self._pages[-1] if self._pages else 0
+
+    def section(self, start, stop):
+        """New index holding sentences [start, stop), e.g. the pages of one chapter"""
+        section = SentenceIndex()
+        base = self._offsets[start]
+        section._buffer = self._buffer[base:self._offsets[stop]]
+        section._offsets = array("Q", (offset - base for offset in self._offsets[start:stop + 1]))
+        section._pages = self._pages[start:stop]
+        return section
+
+    def nbytes(self):
+        """Approximate memory used by the index itself"""
+        return (len(self._buffer) + self._offsets.itemsize * len(self._offsets)
+                + self._pages.itemsize * len(self._pages))
+
+    def to_dict(self):
+        """JSON-friendly form for the text cache"""
+        return {
+            "text": self._buffer.decode("utf-8"),
+            "offsets": self._offsets.tolist(),
+            "pages": self._pages.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        index = cls()
+        index._buffer = bytearray(data["text"].encode("utf-8"))
+        index._offsets = array("Q", data["offsets"])
+        index._pages = array("I", data["pages"])
+        return index
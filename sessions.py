@@ -0,0 +1,73 @@
+import json
+import os
+import time
+
+from atomic_write import write_json_atomic
+
+
+def default_state_dir():
+    """Per-user state directory, honouring XDG_STATE_HOME"""
+    base = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(base, "pdf-text-reader")
+
+
+class SessionStore:
+    """Reading positions and speech settings per document, saved to one JSON file
+
+    checkpoint() is cheap and may be called after every sentence: the file is
+    rewritten at most once every `min_interval` seconds, and flush() writes
+    whatever is still pending.
+    """
+
+    def __init__(self, path=None, min_interval=5.0, max_sessions=100):
+        self.path = path or os.path.join(default_state_dir(), "sessions.json")
+        self.min_interval = min_interval
+        self.max_sessions = max_sessions
+        self._sessions = None
+        self._dirty = False
+        self._last_write = 0.0
+
+    def _load(self):
+        if self._sessions is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._sessions = json.load(f)
+            except (OSError, ValueError):
+                self._sessions = {}
+        return self._sessions
+
+    def get(self, doc_hash):
+        """Saved session for a document, or None"""
+        return self._load().get(doc_hash)
+
+    def checkpoint(self, doc_hash, force=False, **state):
+        """Record the current position; written to disk at a bounded rate"""
+        sessions = self._load()
+        session = dict(state, updated=time.time())
+        sessions.pop(doc_hash, None)
+        sessions[doc_hash] = session  # most recently used last
+        self._dirty = True
+        if force or time.monotonic() - self._last_write >= self.min_interval:
+            self.flush()
+
+    def clear(self, doc_hash):
+        """Forget a document's session, e.g. once it has been read to the end"""
+        if self._load().pop(doc_hash, None) is not None:
+            self._dirty = True
+            self.flush()
+
+    def flush(self):
+        """Write pending changes now"""
+        if not self._dirty:
+            return True
+        sessions = self._load()
+        while len(sessions) > self.max_sessions:
+            del sessions[next(iter(sessions))]
+        try:
+            write_json_atomic(self.path, sessions)
+        except OSError as e:
+            print(f"⚠️  Unable to save reading position: {e}")
+            return False
+        self._dirty = False
+        self._last_write = time.monotonic()
+        return True
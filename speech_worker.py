@@ -0,0 +1,224 @@
+import queue
+import threading
+import time
+
+import instrumentation
+
+
+class SpeechJob:
+    """A single utterance queued for the speech worker"""
+
+    def __init__(self, text, output_path=None, on_done=None):
+        self.text = text
+        self.output_path = output_path  # render to this file instead of speaking
+        self.on_done = on_done
+        self.done = threading.Event()
+        self.ok = False
+        self.cancelled = False
+        self.interrupted = False
+        self.word_offset = 0  # character offset of the last word the engine started
+        self.latency = None   # seconds from say() to the engine starting to speak
+        self.duration = None  # seconds from say() until runAndWait() returned
+        self.call = None      # run call(engine) instead of speaking, keeping the result
+        self.result = None
+
+    def cancel(self):
+        """Skip the job, or stop it at the next word if it is already playing"""
+        self.cancelled = True
+
+
+class SpeechWorker:
+    """Long-lived thread that owns one TTS engine and speaks queued sentences"""
+
+    def __init__(self, engine_factory):
+        self.engine_factory = engine_factory
+        self.engine = None
+        self.init_time = None
+        self.latencies = []
+        self._jobs = queue.Queue()
+        self._pending_settings = {}
+        self._settings_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = None
+        self._current_job = None
+        self._started_at = None
+
+    def start(self, timeout=10):
+        """Start the worker thread and wait until its engine is ready"""
+        if self._thread and self._thread.is_alive():
+            return self.engine is not None
+
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="speech-worker", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout)
+        return self.engine is not None
+
+    def wait_ready(self, timeout=10):
+        """Wait for an engine started with start(timeout=0); False if it failed"""
+        self._ready.wait(timeout)
+        return self.engine is not None
+
+    def is_running(self):
+        """True while the worker thread runs, even if its engine is still starting"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self, timeout=5):
+        """Ask the worker to shut down and release its engine"""
+        if self._thread and self._thread.is_alive():
+            self._jobs.put(None)
+            self._thread.join(timeout)
+        self._thread = None
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive() and self.engine is not None
+
+    def update_settings(self, rate=None, volume=None, voice=None):
+        """Queue property changes; they are applied before the next utterance"""
+        with self._settings_lock:
+            if rate is not None:
+                self._pending_settings["rate"] = rate
+            if volume is not None:
+                self._pending_settings["volume"] = volume
+            if voice is not None:
+                self._pending_settings["voice"] = voice
+
+    def submit(self, text, output_path=None, on_done=None):
+        """Queue a sentence without waiting; on_done(job) runs when it finishes"""
+        job = SpeechJob(text, output_path, on_done)
+        self._jobs.put(job)
+        return job
+
+    def speak(self, text):
+        """Queue a sentence and block until it has been spoken"""
+        return self.wait(self.submit(text))
+
+    def render_to_file(self, text, output_path):
+        """Synthesize a sentence into an audio file on the worker's engine"""
+        return self.wait(self.submit(text, output_path))
+
+    def call(self, func):
+        """Run func(engine) on the worker thread, e.g. to read engine properties; None on failure"""
+        job = SpeechJob(None)
+        job.call = func
+        self._jobs.put(job)
+        return job.result if self.wait(job) else None
+
+    def wait(self, job):
+        """Block until a submitted job has finished"""
+        if not self.is_alive():
+            return False
+        while not job.done.wait(0.5):
+            if not self._thread.is_alive():
+                return False
+        return job.ok
+
+    def latency_report(self):
+        """Summarise per-sentence engine latency in milliseconds"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        count = len(ordered)
+        return {
+            "sentences": count,
+            "avg_ms": sum(ordered) / count * 1000,
+            "p95_ms": ordered[min(count - 1, int(count * 0.95))] * 1000,
+            "max_ms": ordered[-1] * 1000,
+        }
+
+    def _apply_settings(self):
+        with self._settings_lock:
+            pending = self._pending_settings
+            self._pending_settings = {}
+        for name, value in pending.items():
+            try:
+                self.engine.setProperty(name, value)
+            except Exception as e:
+                print(f"⚠️  Unable to apply {name}={value}: {e}")
+
+    def _on_started_utterance(self, name):
+        if self._current_job is not None and self._started_at is not None:
+            self._current_job.latency = time.perf_counter() - self._started_at
+
+    def _on_started_word(self, name, location, length):
+        job = self._current_job
+        if job is None:
+            return
+        if job.cancelled:
+            # pyttsx3 only supports stopping from inside its own callbacks
+            job.interrupted = True
+            self.engine.stop()
+        else:
+            job.word_offset = location
+
+    def _finish(self, job):
+        job.done.set()
+        if job.on_done:
+            job.on_done(job)
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            self.engine = self.engine_factory()
+        except Exception as e:
+            print(f"Unable to initialize TTS engine: {e}")
+            self.engine = None
+        self.init_time = time.perf_counter() - started
+        instrumentation.record("engine.init", self.init_time, ok=self.engine is not None)
+        self._ready.set()
+
+        if not self.engine:
+            return
+
+        try:
+            self.engine.connect("started-utterance", self._on_started_utterance)
+            self.engine.connect("started-word", self._on_started_word)
+        except Exception:
+            pass
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+
+            if job.cancelled:
+                job.interrupted = True
+                self._finish(job)
+                continue
+
+            if job.call is not None:
+                try:
+                    job.result = job.call(self.engine)
+                    job.ok = True
+                except Exception as e:
+                    print(f"⚠️  Engine query failed: {e}")
+                self._finish(job)
+                continue
+
+            self._apply_settings()
+            self._current_job = job
+            self._started_at = time.perf_counter()
+            try:
+                if job.output_path:
+                    self.engine.save_to_file(job.text, job.output_path)
+                else:
+                    self.engine.say(job.text)
+                self.engine.runAndWait()
+                job.ok = True
+            except Exception as e:
+                print(f"❌ Error speaking sentence: {e}")
+            finally:
+                job.duration = time.perf_counter() - self._started_at
+                if job.latency is not None and not job.output_path:
+                    self.latencies.append(job.latency)
+                instrumentation.record("speech.render" if job.output_path else "speech.say", job.duration,
+                                       chars=len(job.text), ok=job.ok, interrupted=job.interrupted,
+                                       latency_ms=job.latency * 1000 if job.latency is not None else None)
+                self._current_job = None
+                self._finish(job)
+
+        try:
+            self.engine.stop()
+        except Exception:
+            pass
+        self.engine = None
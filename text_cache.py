@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+
+from atomic_write import write_json_atomic
+
+# Bump when the layout of cache entries changes
+CACHE_FORMAT = 2
+
+
+def default_cache_dir():
+    """Per-user cache directory, honouring XDG_CACHE_HOME"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pdf-text-reader")
+
+
+def file_sha256(file_name):
+    """Hex SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_name, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TextCache:
+    """On-disk cache of extracted page text and sentences, keyed by PDF content hash"""
+
+    def __init__(self, cache_dir=None, max_bytes=256 * 1024 * 1024, version=""):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.version = version  # a string, or a function returning one when first needed
+        self.max_hashes = 4096
+        self._hashes_path = os.path.join(self.cache_dir, "hashes.json")
+        self._hashes = None
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_hashes(self):
+        if self._hashes is None:
+            try:
+                with open(self._hashes_path, "r", encoding="utf-8") as f:
+                    self._hashes = json.load(f)
+            except (OSError, ValueError):
+                self._hashes = {}
+        return self._hashes
+
+    def content_hash(self, file_name):
+        """SHA-256 of the file, reused while its path, size and mtime are unchanged"""
+        stat = os.stat(file_name)
+        stat_key = f"{os.path.abspath(file_name)}|{stat.st_size}|{stat.st_mtime_ns}"
+        hashes = self._load_hashes()
+        if stat_key in hashes:
+            return hashes[stat_key]
+
+        hashes[stat_key] = file_sha256(file_name)
+        while len(hashes) > self.max_hashes:
+            del hashes[next(iter(hashes))]
+        try:
+            write_json_atomic(self._hashes_path, hashes)
+        except OSError:
+            pass
+        return hashes[stat_key]
+
+    def key_for(self, file_name):
+        """Cache key for a PDF: content hash combined with the extractor version"""
+        if callable(self.version):
+            self.version = self.version()
+        combined = f"{self.content_hash(file_name)}|{CACHE_FORMAT}|{self.version}"
+        return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+
+    def load(self, key):
+        """Return the cached {'pages': [...], 'sentences': {...}} entry or None"""
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)  # mark as recently used
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key, pages, sentences):
+        """Save page texts and a SentenceIndex dict, then evict past the size limit"""
+        try:
+            write_json_atomic(self._entry_path(key), {"pages": pages, "sentences": sentences})
+            self.evict()
+            return True
+        except OSError as e:
+            print(f"⚠️  Unable to write text cache: {e}")
+            return False
+
+    def invalidate(self, key=None):
+        """Remove one cache entry, or every entry when no key is given"""
+        if key is not None:
+            paths = [self._entry_path(key)]
+        else:
+            paths = [entry.path for entry in self._entries()] + [self._hashes_path]
+            self._hashes = None
+
+        removed = 0
+        for path in paths:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        while entries and total > self.max_bytes:
+            oldest = entries.pop(0)
+            total -= oldest.stat().st_size
+            try:
+                os.remove(oldest.path)
+            except OSError:
+                pass
+
+    def _entries(self):
+        try:
+            return [entry for entry in os.scandir(self.cache_dir)
+                    if entry.name.endswith(".json") and entry.path != self._hashes_path]
+        except OSError:
+            return []
+
@@ -0,0 +1,110 @@
+"""Streaming text export: per-page or per-sentence records as JSON lines or plain text
+
+Records are written as soon as their page has been extracted and nothing is
+kept for the whole document, so memory stays flat however long the PDF is.
+
+Offsets count characters in the document text, which is every page
+(normalized for speech unless normalize=False) with its whitespace collapsed
+to single spaces, joined by single spaces - exactly what the sentence
+segmenter sees - so text[offset:offset + chars] is the record.
+"""
+import json
+
+from pipeline import extract_pages, normalize_pages, segment_pages
+
+UNITS = ("pages", "sentences")
+FORMATS = ("jsonl", "text")
+
+
+class DocumentText:
+    """Tracks character offsets while a document's text streams past
+
+    Only the text not yet matched to a sentence is kept.
+    """
+
+    def __init__(self):
+        self.length = 0
+        self._window = ""
+        self._window_start = 0
+        self._cursor = 0
+
+    def add_page(self, text):
+        """Append a page; returns (offset, normalised text)"""
+        text = " ".join(text.split())
+        if not text:
+            return self.length, text
+        self._window = self._window[self._cursor:]
+        self._window_start += self._cursor
+        self._cursor = 0
+        if self.length:
+            self._window += " "
+            self.length += 1
+        offset = self.length
+        self._window += text
+        self.length += len(text)
+        return offset, text
+
+    def locate(self, sentence):
+        """Offset of the next occurrence of sentence, which must be a slice of the pages added"""
+        position = self._window.find(sentence, self._cursor)
+        if position < 0:
+            return None
+        self._cursor = position + len(sentence)
+        return self._window_start + position
+
+
+def page_records(file_name, pages):
+    """Yield one record per (page_number, text) page"""
+    text = DocumentText()
+    for page_number, page_text in pages:
+        offset, page_text = text.add_page(page_text)
+        yield {"file": file_name, "page": page_number, "offset": offset,
+               "chars": len(page_text), "text": page_text}
+
+
+def sentence_records(file_name, pages, segmenter=None):
+    """Yield one record per sentence; page is where the sentence starts"""
+    text = DocumentText()
+
+    def added(pages):
+        for page_number, page_text in pages:
+            yield page_number, text.add_page(page_text)[1]
+
+    for number, (sentence, page_number) in enumerate(segment_pages(added(pages), segmenter)):
+        yield {"file": file_name, "page": page_number, "sentence": number,
+               "offset": text.locate(sentence), "chars": len(sentence), "text": sentence}
+
+
+def format_record(record, output_format="jsonl"):
+    """One output line for a record"""
+    if output_format == "jsonl":
+        return json.dumps(record, ensure_ascii=False) + "\n"
+    return record["text"] + "\n"
+
+
+def export_document(file_name, out, unit="sentences", output_format="jsonl", first_page=1, last_page=None,
+                    workers=1, use_mmap=False, normalize=True):
+    """Write the records of one PDF to the text file out; returns (records, pages) written
+
+    Output is flushed after every page so a downstream process sees each page
+    as soon as it is extracted.
+    """
+    stream = extract_pages(file_name, first_page=first_page, last_page=last_page,
+                           workers=workers, use_mmap=use_mmap)
+
+    def flushed(stream):
+        for page in stream:
+            yield page
+            out.flush()  # the records of this page have been written by now
+
+    records = page_records if unit == "pages" else sentence_records
+    count = 0
+    try:
+        pages = normalize_pages(flushed(stream)) if normalize else flushed(stream)
+        for record in records(file_name, pages):
+            out.write(format_record(record, output_format))
+            count += 1
+        out.flush()
+    finally:
+        stream.close()
+    return count, len(stream.page_range)
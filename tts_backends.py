@@ -0,0 +1,232 @@
+import importlib
+import re
+import shutil
+import subprocess
+import threading
+import time
+import wave
+
+WORD_PATTERN = re.compile(r"\S+")
+
+
+class Voice:
+    """Voice description in the shape pyttsx3 returns"""
+
+    def __init__(self, id, name, languages=()):
+        self.id = id
+        self.name = name
+        self.languages = list(languages)
+
+
+class Engine:
+    """Base for backends that mimic the part of the pyttsx3 Engine API the reader uses
+
+    say()/save_to_file() queue work, runAndWait() performs it, firing the
+    'started-utterance', 'started-word' and 'finished-utterance' callbacks,
+    and stop() (typically called from a callback) interrupts it.
+    """
+
+    def __init__(self, rate=180, volume=1.0, voice=None):
+        self.properties = {"rate": rate, "volume": volume, "voice": voice, "voices": []}
+        self._callbacks = {}
+        self._queue = []
+        self._stopped = threading.Event()
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+    def getProperty(self, name):
+        return self.properties.get(name)
+
+    def connect(self, topic, callback):
+        self._callbacks.setdefault(topic, []).append(callback)
+        return topic, callback
+
+    def disconnect(self, token):
+        topic, callback = token
+        self._callbacks.get(topic, []).remove(callback)
+
+    def say(self, text, name=None):
+        self._queue.append((name, text, None))
+
+    def save_to_file(self, text, path, name=None):
+        self._queue.append((name, text, path))
+
+    def stop(self):
+        self._stopped.set()
+
+    def runAndWait(self):
+        queued, self._queue = self._queue, []
+        self._stopped.clear()
+        for name, text, path in queued:
+            self._notify("started-utterance", name)
+            if path:
+                self.render(text, path)
+                completed = True
+            else:
+                completed = self.speak(text, name)
+            self._notify("finished-utterance", name, completed)
+            if self._stopped.is_set():
+                break
+
+    def seconds_per_word(self):
+        return 60.0 / max(1, self.properties["rate"])
+
+    def speak(self, text, name):
+        """Speak text; return False if stop() interrupted it"""
+        raise NotImplementedError
+
+    def render(self, text, path):
+        """Write text as audio to path"""
+        raise NotImplementedError
+
+    def _notify(self, topic, *args):
+        for callback in list(self._callbacks.get(topic, ())):
+            callback(*args)
+
+    def _announce_words(self, text, name, still_speaking):
+        """Fire 'started-word' at the estimated time of each word while still_speaking()"""
+        started = time.perf_counter()
+        for number, word in enumerate(WORD_PATTERN.finditer(text)):
+            # Wait until this word is due, or until speech ends or is stopped
+            due = started + number * self.seconds_per_word() * self.properties.get("time_scale", 1.0)
+            while time.perf_counter() < due:
+                if self._stopped.is_set() or not still_speaking():
+                    return not self._stopped.is_set()
+                time.sleep(min(0.01, max(0.0, due - time.perf_counter())))
+            if self._stopped.is_set():
+                return False
+            self._notify("started-word", name, word.start(), word.end() - word.start())
+            if self._stopped.is_set():
+                return False
+        return True
+
+
+class NullEngine(Engine):
+    """Produces no sound: 'speaks' for as long as the text would take at the current rate
+
+    time_scale shortens the simulated duration (0 = instant), and rendered
+    files are silent WAVs of the simulated length. Useful for benchmarks and
+    machines without an audio device.
+    """
+
+    def __init__(self, rate=180, volume=1.0, voice=None, time_scale=1.0):
+        super().__init__(rate, volume, voice)
+        self.properties["time_scale"] = time_scale
+        self.properties["voices"] = [Voice("null", "Null (silent)", ["en_US"])]
+
+    def duration(self, text):
+        return len(WORD_PATTERN.findall(text)) * self.seconds_per_word()
+
+    def speak(self, text, name):
+        finishes = time.perf_counter() + self.duration(text) * self.properties["time_scale"]
+        completed = self._announce_words(text, name, lambda: time.perf_counter() < finishes)
+        while completed and time.perf_counter() < finishes:
+            if self._stopped.wait(min(0.05, finishes - time.perf_counter())):
+                return False
+        return completed
+
+    def render(self, text, path, framerate=8000):
+        with wave.open(path, "wb") as audio:
+            audio.setnchannels(1)
+            audio.setsampwidth(2)
+            audio.setframerate(framerate)
+            audio.writeframes(b"\0\0" * int(self.duration(text) * framerate))
+
+
+class EspeakEngine(Engine):
+    """Runs the espeak-ng (or espeak) command for each utterance
+
+    Word callbacks are estimated from the rate, since the command does not
+    report progress; stop() ends the process immediately.
+    """
+
+    def __init__(self, rate=180, volume=1.0, voice=None):
+        super().__init__(rate, volume, voice)
+        self.command = shutil.which("espeak-ng") or shutil.which("espeak")
+        if not self.command:
+            raise RuntimeError("espeak-ng or espeak was not found on PATH")
+        self._process = None
+        self.properties["voices"] = self._list_voices()
+
+    def _arguments(self, text):
+        arguments = [self.command, "-s", str(int(self.properties["rate"])),
+                     "-a", str(int(self.properties["volume"] * 200))]
+        if self.properties["voice"]:
+            arguments += ["-v", self.properties["voice"]]
+        return arguments + ["--", text]
+
+    def _list_voices(self):
+        try:
+            output = subprocess.run([self.command, "--voices"], capture_output=True, text=True,
+                                    timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            return []
+        voices = []
+        for line in output.splitlines()[1:]:
+            # Pty Language Age/Gender VoiceName File Other-languages
+            fields = line.split()
+            if len(fields) >= 5:
+                voices.append(Voice(fields[4], fields[3].replace("_", " "), [fields[1]]))
+        return voices
+
+    def speak(self, text, name):
+        self._process = subprocess.Popen(self._arguments(text), stdout=subprocess.DEVNULL,
+                                         stderr=subprocess.DEVNULL)
+        try:
+            completed = self._announce_words(text, name, lambda: self._process.poll() is None)
+            while completed and self._process.poll() is None:
+                if self._stopped.wait(0.02):
+                    completed = False
+            return completed
+        finally:
+            if self._process.poll() is None:
+                self._process.terminate()
+                self._process.wait()
+            self._process = None
+
+    def stop(self):
+        super().stop()
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+    def render(self, text, path):
+        arguments = self._arguments(text)
+        subprocess.run(arguments[:-2] + ["-w", path] + arguments[-2:], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def pyttsx3_engine(rate=180, volume=1.0, voice=None):
+    """The system engine through pyttsx3 (live playback and save_to_file)"""
+    import pyttsx3
+
+    engine = pyttsx3.init()
+    engine.setProperty("rate", rate)
+    engine.setProperty("volume", volume)
+    if voice:
+        engine.setProperty("voice", voice)
+    return engine
+
+
+BACKENDS = {
+    "pyttsx3": pyttsx3_engine,
+    "espeak": EspeakEngine,
+    "null": NullEngine,
+}
+
+
+def load_backend(name):
+    """Engine factory for a backend name, or one given as 'module:factory'"""
+    if name in BACKENDS:
+        return BACKENDS[name]
+
+    module_name, _, attribute = name.partition(":")
+    if not attribute:
+        raise ValueError(f"Unknown TTS backend '{name}' (use one of {', '.join(BACKENDS)} or module:factory)")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def create_engine(backend="pyttsx3", rate=180, volume=1.0, voice=None):
+    """A ready engine of the given backend with the given settings"""
+    return load_backend(backend)(rate=rate, volume=volume, voice=voice)
@@ -0,0 +1,201 @@
+import json
+import os
+import sys
+import time
+
+from atomic_write import write_json_atomic
+from text_cache import default_cache_dir
+
+# Bump when the layout of the catalog file changes
+CATALOG_FORMAT = 1
+
+# Common language mappings for cleaner display
+LANGUAGE_NAMES = {
+    'en_US': 'English (US)',
+    'en_GB': 'English (UK)',
+    'en_AU': 'English (AU)',
+    'en_CA': 'English (CA)',
+    'es_ES': 'Spanish (Spain)',
+    'es_MX': 'Spanish (Mexico)',
+    'fr_FR': 'French (France)',
+    'fr_CA': 'French (Canada)',
+    'de_DE': 'German',
+    'it_IT': 'Italian',
+    'pt_BR': 'Portuguese (Brazil)',
+    'pt_PT': 'Portuguese (Portugal)',
+    'ru_RU': 'Russian',
+    'ja_JP': 'Japanese',
+    'ko_KR': 'Korean',
+    'zh_CN': 'Chinese (Simplified)',
+    'zh_TW': 'Chinese (Traditional)',
+    'ar_SA': 'Arabic',
+    'hi_IN': 'Hindi',
+    'th_TH': 'Thai',
+    'sv_SE': 'Swedish',
+    'no_NO': 'Norwegian',
+    'da_DK': 'Danish',
+    'fi_FI': 'Finnish',
+    'pl_PL': 'Polish',
+    'nl_NL': 'Dutch',
+    'tr_TR': 'Turkish',
+}
+
+
+def language_name(code):
+    """Readable name for a language code such as 'en_US'"""
+    if code in LANGUAGE_NAMES:
+        return LANGUAGE_NAMES[code]
+
+    # If not in mapping, try to extract language code
+    if '_' in code:
+        lang_code, country_code = code.split('_', 1)
+        return f"{lang_code.upper()} ({country_code.upper()})"
+
+    # Return as-is if no pattern matches
+    return code.title()
+
+
+def primary_language(languages):
+    """Display name of the first language in a voice's language list"""
+    if not languages or languages == ["Unknown"]:
+        return "Unknown"
+    return language_name(languages[0])
+
+
+def clean_language(language):
+    """Language codes as text; espeak reports them as bytes with a priority prefix"""
+    if isinstance(language, bytes):
+        language = language.decode("utf-8", "ignore")
+    language = "".join(ch for ch in language if ch.isprintable()).strip().replace("-", "_")
+    if "_" in language:
+        # 'en-us' -> 'en_US' so it matches LANGUAGE_NAMES
+        lang_code, country_code = language.split("_", 1)
+        language = f"{lang_code.lower()}_{country_code.upper()}"
+    return language
+
+
+def engine_fingerprint(backend="pyttsx3"):
+    """Identifies the installed TTS setup; a change invalidates the catalog"""
+    try:
+        from importlib.metadata import version
+        pyttsx3_version = version("pyttsx3")
+    except Exception:
+        pyttsx3_version = "unknown"
+    return f"{CATALOG_FORMAT}|{sys.platform}|pyttsx3-{pyttsx3_version}|{backend}"
+
+
+class VoiceCatalog:
+    """System voices enumerated once, saved to disk and indexed by id, name and language"""
+
+    def __init__(self, path=None, max_age=7 * 24 * 3600, backend="pyttsx3"):
+        self.backend = backend
+        self.path = path or os.path.join(default_cache_dir(), "voices", "catalog.json")
+        self.max_age = max_age
+        self.voices = []
+        self.by_id = {}
+        self.by_name = {}
+        self.by_language = {}
+        self.loaded = False
+
+    def load(self, enumerate_voices, refresh=False):
+        """Fill the catalog from disk, or from enumerate_voices() when stale or missing"""
+        if self.loaded and not refresh:
+            return bool(self.voices)
+
+        voices = None if refresh else self._read()
+        if voices is None:
+            voices = [self._voice_info(i, voice) for i, voice in enumerate(enumerate_voices() or [])]
+            if voices:
+                self._write(voices)
+
+        self._index(voices)
+        self.loaded = True
+        return bool(self.voices)
+
+    def invalidate(self):
+        """Forget the saved catalog so the next load enumerates voices again"""
+        self.loaded = False
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def languages(self):
+        """Language display names in sorted order"""
+        return sorted(self.by_language)
+
+    def grouped(self):
+        """All voices in the order they are listed when grouped by language"""
+        return [voice for language in self.languages() for voice in self.by_language[language]]
+
+    def find(self, voice=None, language=None):
+        """Best voice matching an id or name and/or a language code or name; None if none"""
+        candidates = self.voices
+        if language:
+            candidates = self.match_language(language)
+        if not voice:
+            return candidates[0] if candidates else None
+
+        if voice in self.by_id and self.by_id[voice] in candidates:
+            return self.by_id[voice]
+        wanted = voice.strip().lower()
+        exact = self.by_name.get(wanted)
+        if exact is not None and exact in candidates:
+            return exact
+        for test in (str.startswith, str.__contains__):
+            for info in candidates:
+                if test(info['name'].lower(), wanted):
+                    return info
+        return None
+
+    def match_language(self, language):
+        """Voices whose languages match 'en', 'en_US', 'en-us' or a name like 'English (UK)'"""
+        wanted = language.strip().lower().replace("-", "_")
+        if language in self.by_language:
+            return self.by_language[language]
+        matches = []
+        for info in self.voices:
+            codes = [code.lower() for code in info['languages']]
+            names = [language_name(code).lower() for code in info['languages']]
+            if (wanted in codes or any(code.split("_")[0] == wanted for code in codes)
+                    or any(name == wanted or name.startswith(wanted) for name in names)):
+                matches.append(info)
+        return matches
+
+    def _voice_info(self, index, voice):
+        languages = [clean_language(language) for language in (voice.languages or [])]
+        return {
+            'index': index,
+            'id': voice.id,
+            'name': voice.name if voice.name else f"Voice {index + 1}",
+            'languages': [language for language in languages if language] or ["Unknown"],
+        }
+
+    def _index(self, voices):
+        self.voices = voices
+        self.by_id = {voice['id']: voice for voice in voices}
+        self.by_name = {}
+        self.by_language = {}
+        for voice in voices:
+            self.by_name.setdefault(voice['name'].lower(), voice)
+            self.by_language.setdefault(primary_language(voice['languages']), []).append(voice)
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("fingerprint") != engine_fingerprint(self.backend):
+            return None
+        if time.time() - data.get("created", 0) > self.max_age:
+            return None
+        return data.get("voices")
+
+    def _write(self, voices):
+        """Save the catalog; a failure only means voices are enumerated again next time"""
+        try:
+            write_json_atomic(self.path, {"fingerprint": engine_fingerprint(self.backend), "created": time.time(),
+                                          "voices": voices})
+        except OSError:
+            pass  # the catalog still works for this run